@@ -0,0 +1,21 @@
+# Index and query declarations for assets (see app.lib.db.indexes).
+from app.lib.db.indexes import IndexSpec, QuerySpec
+from app.lib.db.repository import UPSERT_ASSETS_AQL, EXISTING_ASSET_KEYS_AQL
+
+
+INDEXES = [
+    IndexSpec(collection="Assets", name="idx_assets_type", fields=("type",)),
+]
+
+QUERIES = [
+    QuerySpec(
+        name="batch_upsert_assets",
+        aql=UPSERT_ASSETS_AQL,
+        bind_vars={"assets": [{"hash": "explain", "text": "", "type": "TEXT"}]}
+    ),
+    QuerySpec(
+        name="existing_asset_keys",
+        aql=EXISTING_ASSET_KEYS_AQL,
+        bind_vars={"keys": ["explain"]}
+    ),
+]
@@ -1,5 +1,5 @@
 import msgspec
-from typing import Optional
+from typing import Optional, Any
 from enum import Enum
 from app.domain.shared.models import ArangoDocument
 
@@ -17,3 +17,12 @@ class Asset(ArangoDocument):
     asset_text: Optional[str] = None
     image_data: Optional[dict] = None # {url, file_size}
     name: Optional[str] = None # Optional name for management
+
+class AssetIngestBatch(msgspec.Struct):
+    """
+    Output of the asset-ingest stage: deduplicated Asset vertices
+    (hash, text, type) and uses_asset links (from_id, to_id, field_type, pinned_field).
+    """
+    assets: list[dict[str, Any]]
+    links: list[dict[str, Any]]
+    known_assets: int = 0  # Assets skipped because they already exist
@@ -1,5 +1,32 @@
 import hashlib
-from app.domain.assets.models import AssetType
+from typing import Iterable, List, Tuple
+from app.domain.assets.models import AssetType, AssetIngestBatch
+
+
+def normalize_asset_text(text: str) -> str:
+    """
+    Canonical form used for hashing: surrounding whitespace removed and
+    inner whitespace runs collapsed. Casing is preserved (brand spelling).
+    """
+    return " ".join(text.split())
+
+
+class AssetHasher:
+    """
+    Hashes many asset texts of the same type.
+    
+    The "{type}:" prefix is fed into one SHA-256 state up front; each text
+    only copies that state and adds its own bytes. Digests are identical to
+    AssetService.generate_asset_hash.
+    """
+    def __init__(self, type: AssetType):
+        self._base = hashlib.sha256(f"{type}:".encode("utf-8"))
+
+    def hash(self, text: str) -> str:
+        h = self._base.copy()
+        h.update(normalize_asset_text(text).encode("utf-8"))
+        return h.hexdigest()
+
 
 class AssetService:
     """
@@ -12,11 +39,57 @@ class AssetService:
         Generates a deterministic SHA-256 hash for an asset.
         This serves as the _key in ArangoDB to ensure deduplication.
         """
-        # Normalize: strip whitespace, lowercase (optional but good for strict dedupe)
-        # We stick to raw text for now to preserve casing if needed by the brand.
-        payload = f"{type}:{text}"
+        # Normalize whitespace only; casing is preserved in case the brand needs it.
+        payload = f"{type}:{normalize_asset_text(text)}"
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def collect_text_assets(
+        ad_groups: Iterable[Tuple[str, Iterable[str], Iterable[str]]]
+    ) -> AssetIngestBatch:
+        """
+        Normalizes and hashes all RSA texts of a structure in one pass.
+        
+        Args:
+            ad_groups: (ad group _id, headlines, descriptions) per ad group
+            
+        Returns:
+            Unique Asset vertices and one uses_asset link per
+            (ad group, asset, field type)
+        """
+        hasher = AssetHasher(AssetType.TEXT)
+        hashes: dict[str, str] = {}
+        assets: List[dict] = []
+        links: List[dict] = []
+        seen_links = set()
+        
+        for ad_group_id, headlines, descriptions in ad_groups:
+            for field_type, texts in (("HEADLINE", headlines), ("DESCRIPTION", descriptions)):
+                for text in texts:
+                    text = normalize_asset_text(text)
+                    asset_hash = hashes.get(text)
+                    if asset_hash is None:
+                        asset_hash = hasher.hash(text)
+                        hashes[text] = asset_hash
+                        assets.append({
+                            "hash": asset_hash,
+                            "text": text,
+                            "type": AssetType.TEXT
+                        })
+                    
+                    link = (ad_group_id, asset_hash, field_type)
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                    links.append({
+                        "from_id": ad_group_id,
+                        "to_id": f"Assets/{asset_hash}",
+                        "field_type": field_type,
+                        "pinned_field": None
+                    })
+        
+        return AssetIngestBatch(assets=assets, links=links)
+
     async def get_all(self):
         pass
 
@@ -3,12 +3,12 @@ from litestar.params import Parameter
 from litestar.response import Redirect
 from litestar.di import Provide
 
-from app.lib.db.client import ArangoClient
+from app.lib.db.client import get_shared_client
 from app.lib.auth.service import AuthService
 
 # Dependency Factory
 async def provide_auth_service() -> AuthService:
-    return AuthService(ArangoClient())
+    return AuthService(get_shared_client())
 
 class AuthController(Controller):
     path = "/auth"
@@ -1,8 +1,19 @@
+import msgspec
+from typing import Any, AsyncIterator
 from litestar import Controller, get, post
 from litestar.di import Provide
+from litestar.params import Parameter
+from litestar.status_codes import HTTP_202_ACCEPTED
+from litestar.response import Stream
 from app.lib.ai.client import GeminiService
+from app.lib.ai.cache import CacheStats, get_response_cache
+from app.lib.jobs.client import JobInfo, GENERATION_QUEUE, enqueue, get_job_info
 from app.domain.campaigns.services import CampaignService
-from app.domain.campaigns.models import GenerateAssetsRequest, CampaignStructure, ImportReportRequest
+from app.domain.campaigns.models import (
+    GenerateAssetsRequest, GeneratedCampaign, ImportReportRequest, GenerationEvent, CampaignTree, CampaignTreePage,
+    CampaignPage
+)
+from app.domain.shared.models import EntityStatus
 from app.lib.db.client import get_arango_db
 from arango.database import StandardDatabase
 
@@ -13,6 +24,44 @@ async def provide_campaign_service(db: StandardDatabase) -> CampaignService:
 async def provide_gemini_service() -> GeminiService:
     return GeminiService()
 
+_event_encoder = msgspec.json.Encoder()
+
+async def encode_ndjson(events: AsyncIterator[GenerationEvent]) -> AsyncIterator[bytes]:
+    """
+    Encodes progress events as NDJSON, one line per event.
+    Failures are reported in-band since the status code is already sent.
+    """
+    buffer = bytearray()
+    try:
+        async for event in events:
+            _event_encoder.encode_into(event, buffer)
+            buffer.extend(b"\n")
+            yield bytes(buffer)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        _event_encoder.encode_into(GenerationEvent(stage="error", message=str(e)), buffer)
+        buffer.extend(b"\n")
+        yield bytes(buffer)
+
+async def encode_rows_ndjson(rows: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """
+    Encodes documents as NDJSON as they arrive from the database cursor.
+    A failure mid-stream is reported as a final {"error": ...} line.
+    """
+    buffer = bytearray()
+    try:
+        async for row in rows:
+            _event_encoder.encode_into(row, buffer)
+            buffer.extend(b"\n")
+            yield bytes(buffer)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        _event_encoder.encode_into({"error": str(e)}, buffer)
+        buffer.extend(b"\n")
+        yield bytes(buffer)
+
 class CampaignController(Controller):
     path = "/api/v1/campaigns" # Matched frontend prefix
     dependencies = {
@@ -21,19 +70,82 @@ class CampaignController(Controller):
         "gemini_service": Provide(provide_gemini_service)
     }
 
+    @get("/")
+    async def list_campaigns(
+        self,
+        campaign_service: CampaignService,
+        customer_id: str | None = None,
+        status: EntityStatus | None = None,
+        is_dirty: bool | None = None,
+        fields: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int = Parameter(default=100, ge=1, le=1000)
+    ) -> CampaignPage:
+        """
+        Campaign list with filters and projection, paginated by cursor.
+        """
+        return await campaign_service.list_campaigns(customer_id, status, is_dirty, fields, cursor, limit)
+
+    @get("/export", media_type="application/x-ndjson")
+    async def export_campaigns(
+        self,
+        campaign_service: CampaignService,
+        customer_id: str | None = None,
+        status: EntityStatus | None = None,
+        is_dirty: bool | None = None,
+        fields: list[str] | None = None,
+        cursor: str | None = None
+    ) -> Stream:
+        """
+        All matching campaigns as NDJSON, streamed from the database cursor.
+        """
+        rows = campaign_service.stream_campaigns(customer_id, status, is_dirty, fields, cursor)
+        return Stream(encode_rows_ndjson(rows), media_type="application/x-ndjson")
+
+    @get("/tree")
+    async def list_campaign_trees(
+        self,
+        campaign_service: CampaignService,
+        customer_id: str | None = None,
+        depth: int = Parameter(default=2, ge=1, le=4),
+        fields: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int = Parameter(default=50, ge=1, le=500)
+    ) -> CampaignTreePage:
+        """
+        Campaign hierarchy (AdsGraph) to the given depth, paginated by cursor.
+        depth: 1 campaigns, 2 ad groups, 3 ads and keywords, 4 ad asset links.
+        """
+        return await campaign_service.get_campaign_trees(customer_id, depth, fields, cursor, limit)
+
+    @get("/{campaign_id:str}/tree")
+    async def get_campaign_tree(
+        self,
+        campaign_id: str,
+        campaign_service: CampaignService,
+        depth: int = Parameter(default=4, ge=1, le=4),
+        fields: list[str] | None = None
+    ) -> CampaignTree:
+        """
+        Single campaign with its hierarchy.
+        """
+        return await campaign_service.get_campaign_tree(campaign_id, depth, fields)
+
     @post("/generate")
     async def generate_assets(
         self,
         data: GenerateAssetsRequest,
         campaign_service: CampaignService
-    ) -> CampaignStructure:
+    ) -> GeneratedCampaign:
         """
         Generate Campaign Structure (AdGroups, Assets) using Gemini and persist to DB.
+        The response carries campaign_id for GET /{campaign_id}/tree.
         """
         try:
             structure = await campaign_service.generate_campaign_structure_from_inputs(
                 landing_page_url=data.landing_page_url,
-                keywords=data.target_keywords
+                keywords=data.target_keywords,
+                bypass_cache=data.bypass_cache
             )
             return structure
         except Exception as e:
@@ -47,9 +159,10 @@ class CampaignController(Controller):
         self,
         data: ImportReportRequest,
         campaign_service: CampaignService
-    ) -> CampaignStructure:
+    ) -> GeneratedCampaign:
         """
         Parse Deep Research Report and generate Campaign Structure.
+        The response carries campaign_id for GET /{campaign_id}/tree.
         """
         # === DEBUG LOGGING (commented out - uncomment to enable) ===
         # import logging
@@ -85,9 +198,90 @@ class CampaignController(Controller):
             traceback.print_exc()
             raise e
 
+    @post("/generate/stream")
+    async def generate_assets_stream(
+        self,
+        data: GenerateAssetsRequest,
+        campaign_service: CampaignService
+    ) -> Stream:
+        """
+        Streaming variant of /generate. Emits NDJSON progress events.
+        """
+        events = campaign_service.stream_campaign_structure_from_inputs(
+            landing_page_url=data.landing_page_url,
+            keywords=data.target_keywords,
+            bypass_cache=data.bypass_cache
+        )
+        return Stream(encode_ndjson(events), media_type="application/x-ndjson")
+
+    @post("/import-report/stream")
+    async def import_report_stream(
+        self,
+        data: ImportReportRequest,
+        campaign_service: CampaignService
+    ) -> Stream:
+        """
+        Streaming variant of /import-report. Emits NDJSON progress events,
+        including each ad group as soon as it is generated.
+        """
+        events = campaign_service.stream_campaign_from_report(
+            report_text=data.report_text,
+            customer_id=data.customer_id
+        )
+        return Stream(encode_ndjson(events), media_type="application/x-ndjson")
+
+    @post("/jobs/generate", status_code=HTTP_202_ACCEPTED)
+    async def enqueue_generate_assets(
+        self,
+        data: GenerateAssetsRequest,
+        idempotency_key: str | None = Parameter(header="Idempotency-Key", default=None)
+    ) -> JobInfo:
+        """
+        Queue /generate as a background job. Poll GET /jobs/{job_id} for the result.
+        """
+        return await enqueue(
+            "generate_campaign_structure_from_inputs",
+            queue_name=GENERATION_QUEUE,
+            idempotency_key=idempotency_key,
+            landing_page_url=data.landing_page_url,
+            keywords=data.target_keywords,
+            bypass_cache=data.bypass_cache
+        )
+
+    @post("/jobs/import-report", status_code=HTTP_202_ACCEPTED)
+    async def enqueue_import_report(
+        self,
+        data: ImportReportRequest,
+        idempotency_key: str | None = Parameter(header="Idempotency-Key", default=None)
+    ) -> JobInfo:
+        """
+        Queue /import-report as a background job. Poll GET /jobs/{job_id} for the result.
+        """
+        return await enqueue(
+            "generate_campaign_from_report",
+            queue_name=GENERATION_QUEUE,
+            idempotency_key=idempotency_key,
+            report_text=data.report_text,
+            customer_id=data.customer_id
+        )
+
+    @get("/jobs/{job_id:str}")
+    async def get_job(self, job_id: str) -> JobInfo:
+        """
+        Status of a generation job; includes the GeneratedCampaign (with campaign_id) once complete.
+        """
+        return await get_job_info(job_id, GENERATION_QUEUE)
+
     @get("/test-gemini")
     async def test_gemini(self, gemini_service: GeminiService) -> dict:
         return await gemini_service.health_check()
 
+    @get("/generation-cache")
+    async def generation_cache_stats(self) -> CacheStats:
+        """
+        Hit/miss counters of the Gemini response cache.
+        """
+        return get_response_cache().stats()
+
 
 
@@ -0,0 +1,162 @@
+import hashlib
+import uuid
+from typing import Any, Dict, List
+from app.domain.assets.services import AssetService
+from app.domain.campaigns.models import CampaignStructure, CampaignGraph
+from app.domain.shared.models import EntityStatus
+from app.lib.db.repository import CampaignRepository, edge_key
+
+
+# sync_status of campaigns created from a generated structure (never synced to Google)
+GENERATED_SYNC_STATUS = "generated"
+
+
+def _sha1(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+def new_generation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def campaign_key(customer_id: str | None, generation_id: str, campaign_name: str) -> str:
+    """
+    Deterministic Campaigns _key for a generated campaign.
+    
+    Scoped to the customer and the generation run: equal campaign names of
+    other customers, or a later regeneration, get their own subgraph, while
+    re-persisting the same run is idempotent. Hex digests never collide with
+    the numeric keys of synced Google campaigns.
+    """
+    return _sha1(f"campaign:{customer_id or ''}:{generation_id}:{campaign_name}")
+
+
+def ad_group_key(campaign_key: str, ad_group_name: str) -> str:
+    """
+    Deterministic AdGroups _key for a generated ad group (scoped to its campaign).
+    """
+    return _sha1(f"{campaign_key}:{ad_group_name}")
+
+
+def keyword_key(ad_group_key: str, text: str, match_type: str) -> str:
+    """
+    Deterministic Keywords _key; keywords belong to one ad group.
+    """
+    return _sha1(f"{ad_group_key}:{match_type.upper()}:{' '.join(text.lower().split())}")
+
+
+def _edge(from_id: str, to_id: str) -> Dict[str, Any]:
+    return {"_key": edge_key(from_id, to_id), "_from": from_id, "_to": to_id}
+
+
+class CampaignGraphMaterializer:
+    """
+    Writes a generated CampaignStructure as AdsGraph vertices and edges.
+
+    Campaign -> campaign_adgroup -> AdGroup -> adgroup_keyword -> Keyword,
+    AdGroup -> uses_asset -> Asset. Every key is derived from the customer,
+    the generation run and the structure, so persisting the same run again
+    updates documents in place instead of duplicating them, while other
+    customers and regenerations never share documents. The whole graph is written in one unit of work
+    (single stream transaction), and can be read back with
+    CampaignService.get_campaign_tree(campaign_key).
+    """
+    def __init__(self, repository: CampaignRepository):
+        self.repository = repository
+
+    @staticmethod
+    def build(structure: CampaignStructure, customer_id: str | None, generation_id: str) -> CampaignGraph:
+        """
+        Maps the structure to documents (no I/O).
+        """
+        key = campaign_key(customer_id, generation_id, structure.campaign_name)
+        campaign_id = f"Campaigns/{key}"
+        graph = CampaignGraph(
+            campaign_key=key,
+            campaigns=[{
+                "_key": key,
+                "name": structure.campaign_name,
+                # Campaign.customer_id is required; wizard-mode structures have none
+                "customer_id": customer_id or "",
+                "status": EntityStatus.PAUSED.value,
+                "advertising_channel_type": "SEARCH",
+                "sync_status": GENERATED_SYNC_STATUS,
+                "budget_recommendation": structure.budget_recommendation,
+                "language": structure.language,
+                "target_locations": structure.target_locations
+            }],
+            ad_groups=[],
+            keywords=[],
+            assets=[],
+            campaign_adgroup=[],
+            adgroup_keyword=[],
+            uses_asset=[]
+        )
+
+        for ag in structure.ad_groups:
+            ag_key = ad_group_key(key, ag.name)
+            ag_id = f"AdGroups/{ag_key}"
+            graph.ad_groups.append({
+                "_key": ag_key,
+                "name": ag.name,
+                "campaign_name": structure.campaign_name,
+                "status": EntityStatus.PAUSED.value
+            })
+            graph.campaign_adgroup.append(_edge(campaign_id, ag_id))
+
+            seen = set()
+            for kw in ag.keywords:
+                kw_key = keyword_key(ag_key, kw.text, kw.match_type)
+                if kw_key in seen:
+                    continue
+                seen.add(kw_key)
+                graph.keywords.append({"_key": kw_key, "text": kw.text, "match_type": kw.match_type.upper()})
+                graph.adgroup_keyword.append(_edge(ag_id, f"Keywords/{kw_key}"))
+
+        batch = AssetService.collect_text_assets(
+            (f"AdGroups/{doc['_key']}", ag.assets.headlines, ag.assets.descriptions)
+            for doc, ag in zip(graph.ad_groups, structure.ad_groups)
+        )
+        graph.assets = batch.assets
+        graph.uses_asset = CampaignRepository.link_edges(batch.links)
+        return graph
+
+    async def materialize(
+        self,
+        structure: CampaignStructure,
+        customer_id: str | None = None,
+        generation_id: str | None = None
+    ) -> CampaignGraph:
+        """
+        Persists the structure: one asset-key lookup, then all vertices and
+        edges in a single transaction.
+        
+        Args:
+            generation_id: Identifies the generation run; a new one (i.e. a
+                new campaign) if omitted
+        
+        Returns:
+            The written graph (assets already stored are not rewritten)
+        """
+        graph = self.build(structure, customer_id, generation_id or new_generation_id())
+
+        existing = await self.repository.existing_asset_keys([a["hash"] for a in graph.assets])
+        graph.known_assets = len(existing)
+        graph.assets = [a for a in graph.assets if a["hash"] not in existing]
+
+        uow = self.repository.unit_of_work()
+        uow.write("Campaigns", graph.campaigns)
+        uow.write("AdGroups", graph.ad_groups)
+        uow.write("Keywords", graph.keywords)
+        uow.upsert_assets(graph.assets)
+        uow.write("campaign_adgroup", graph.campaign_adgroup)
+        uow.write("adgroup_keyword", graph.adgroup_keyword)
+        uow.write("uses_asset", graph.uses_asset)
+        report = await uow.commit()
+
+        print(
+            f"Materialized campaign {graph.campaign_key}: {len(graph.ad_groups)} ad groups, "
+            f"{len(graph.keywords)} keywords, {len(graph.assets)} new assets "
+            f"({graph.known_assets} known), {report.total} documents"
+        )
+        return graph
@@ -0,0 +1,47 @@
+# Index and query declarations for the campaign graph (see app.lib.db.indexes).
+from app.lib.db.indexes import IndexSpec, QuerySpec
+from app.domain.campaigns.services import (
+    SYNC_CAMPAIGNS_AQL, CAMPAIGN_TREE_MAX_DEPTH, build_campaign_tree_query,
+    build_campaign_list_query
+)
+
+
+INDEXES = [
+    IndexSpec(collection="Campaigns", name="idx_campaigns_customer_status", fields=("customer_id", "status")),
+    # Keyset pagination per customer
+    IndexSpec(collection="Campaigns", name="idx_campaigns_customer_key", fields=("customer_id", "_key")),
+    IndexSpec(collection="Campaigns", name="idx_campaigns_sync", fields=("sync_status", "is_dirty")),
+    # Only generated ad groups carry campaign_name
+    IndexSpec(collection="AdGroups", name="idx_adgroups_campaign_name", fields=("campaign_name",), sparse=True),
+    IndexSpec(collection="uses_asset", name="idx_uses_asset_field_type", fields=("field_type",)),
+]
+
+QUERIES = [
+    QuerySpec(
+        name="sync_campaigns_batch",
+        aql=SYNC_CAMPAIGNS_AQL,
+        bind_vars={"batch": [{"_key": "explain", "name": "", "status": "PAUSED", "serving_status": None}]}
+    ),
+    QuerySpec(
+        name="dirty_campaigns_by_customer",
+        aql="""
+        FOR c IN Campaigns
+            FILTER c.customer_id == @customer_id AND c.is_dirty == true
+            RETURN c._key
+        """,
+        bind_vars={"customer_id": "explain"}
+    ),
+    QuerySpec(
+        name="campaign_trees",
+        aql=build_campaign_tree_query(CAMPAIGN_TREE_MAX_DEPTH),
+        bind_vars={"fields": None, "customer_id": "explain", "cursor": None, "limit": 51}
+    ),
+    QuerySpec(
+        name="list_campaigns",
+        aql=build_campaign_list_query(),
+        bind_vars={
+            "customer_id": "explain", "status": "ENABLED", "is_dirty": None,
+            "fields": None, "cursor": None, "limit": 101
+        }
+    ),
+]
@@ -29,6 +29,7 @@ class GenerateAssetsRequest(msgspec.Struct):
     target_keywords: list[str]
     brand_voice: str | None = None  # e.g., "professional", "playful"
     language: str = "de"  # ISO 639-1 code
+    bypass_cache: bool = False  # Force a fresh Gemini generation
 
 class ImportReportRequest(msgspec.Struct):
     """
@@ -48,6 +49,25 @@ class AIAdGroup(msgspec.Struct):
     keywords: list[Keyword]
     assets: RSAAsset
 
+class AdGroupOutline(msgspec.Struct):
+    """
+    Phase 1 of report parsing: ad group segment without assets.
+    """
+    name: str
+    keywords: list[Keyword]
+    focus: str | None = None  # Short summary of the segment's angle
+
+class CampaignOutline(msgspec.Struct):
+    """
+    Phase 1 of report parsing: campaign skeleton without RSA assets.
+    """
+    campaign_name: str
+    budget_recommendation: float
+    ad_groups: list[AdGroupOutline]
+    summary: str | None = None  # Condensed report, shared by all ad group prompts
+    language: str = "de"
+    target_locations: list[str] = msgspec.field(default_factory=lambda: ["Germany", "Austria", "Switzerland"])
+
 class CampaignStructure(msgspec.Struct):
     campaign_name: str
     budget_recommendation: float
@@ -55,7 +75,42 @@ class CampaignStructure(msgspec.Struct):
     language: str = "de"
     target_locations: list[str] = msgspec.field(default_factory=lambda: ["Germany", "Austria", "Switzerland"])
 
-from typing import Optional, List
+class GeneratedCampaign(CampaignStructure):
+    """
+    A generated CampaignStructure after persisting; re-open it with
+    GET /campaigns/{campaign_id}/tree.
+    """
+    campaign_id: str | None = None  # Campaigns _key of the persisted graph
+    failed_ad_groups: list[str] = []  # Outline ad groups left out after all attempts failed
+
+class GenerationEvent(msgspec.Struct, omit_defaults=True):
+    """
+    Progress event emitted by the streaming generation endpoints (NDJSON).
+    
+    Stages: prompt_sent, tokens_received, validated, ad_group,
+    ad_group_failed (message: the ad group name), persisted, complete, error
+    """
+    stage: str
+    received_chars: int | None = None
+    ad_group: AIAdGroup | None = None
+    structure: CampaignStructure | None = None
+    message: str | None = None
+    campaign_id: str | None = None  # Campaigns _key of the persisted structure
+
+class MutationResult(msgspec.Struct):
+    """
+    Outcome of one operation in a batched Google Ads mutate request,
+    in the same order as the caller's operations.
+    """
+    index: int
+    resource_name: str | None = None
+    errors: list[str] = msgspec.field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+from typing import Any, Dict, Optional, List
 from app.domain.shared.models import ArangoDocument, EntityStatus, AdType
 
 class Campaign(ArangoDocument):
@@ -93,3 +148,76 @@ class AdResponse(ArangoDocument):
     type: AdType
     headlines: List[AdAssetLink] = []
     descriptions: List[AdAssetLink] = []
+
+# --- Campaign hierarchy (AdsGraph read API) ---
+
+class KeywordNode(ArangoDocument):
+    """
+    Keyword vertex below an ad group.
+    """
+    text: Optional[str] = None
+    match_type: Optional[str] = None
+    status: Optional[str] = None
+
+class AdGroupNode(ArangoDocument):
+    """
+    AdGroup vertex with its ads, keywords and directly linked assets.
+    """
+    name: Optional[str] = None
+    status: Optional[str] = None
+    ads: List[AdResponse] = []
+    keywords: List[KeywordNode] = []
+    assets: List[AdAssetLink] = []
+
+class CampaignView(ArangoDocument):
+    """
+    Campaign vertex as returned by list/tree reads.
+    All fields are optional so projected documents decode as well.
+    """
+    customer_id: Optional[str] = None
+    name: Optional[str] = None
+    status: Optional[EntityStatus] = None
+    advertising_channel_type: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    sync_status: Optional[str] = None
+    is_dirty: Optional[bool] = None
+    internal_notes: Optional[str] = None
+    # Generated campaigns only (see CampaignGraphMaterializer)
+    budget_recommendation: Optional[float] = None
+    language: Optional[str] = None
+    target_locations: Optional[List[str]] = None
+
+class CampaignTree(CampaignView):
+    """
+    Campaign vertex with its hierarchy.
+    """
+    ad_groups: List[AdGroupNode] = []
+
+class CampaignTreePage(msgspec.Struct):
+    """
+    One page of campaign trees; pass next_cursor to fetch the following page.
+    """
+    items: List[CampaignTree]
+    next_cursor: Optional[str] = None
+
+class CampaignPage(msgspec.Struct):
+    """
+    One page of the campaign list; pass next_cursor to fetch the following page.
+    """
+    items: List[CampaignView]
+    next_cursor: Optional[str] = None
+
+class CampaignGraph(msgspec.Struct):
+    """
+    A CampaignStructure as AdsGraph documents with deterministic keys.
+    """
+    campaign_key: str
+    campaigns: List[Dict[str, Any]]
+    ad_groups: List[Dict[str, Any]]
+    keywords: List[Dict[str, Any]]
+    assets: List[Dict[str, Any]]
+    campaign_adgroup: List[Dict[str, Any]]
+    adgroup_keyword: List[Dict[str, Any]]
+    uses_asset: List[Dict[str, Any]]
+    known_assets: int = 0  # Assets skipped because they already exist
@@ -1,20 +1,63 @@
-from typing import List, Any, Optional
+import itertools
+import os
+from collections import defaultdict
+from typing import List, Any, Optional, Dict, Callable
 from google.ads.googleads.errors import GoogleAdsException
 from google.ads.googleads.client import GoogleAdsClient
+from app.domain.campaigns.models import CampaignStructure, MutationResult
+
+
+class PolicyExemptionCache:
+    """
+    Remembers exemptible (policy topic, violating text) pairs per customer.
+    
+    Once a text was exempted for a customer, later pushes attach the
+    exemption up front and skip the failing round-trip.
+    """
+    def __init__(self, max_texts_per_customer: int = 10000):
+        self.max_texts_per_customer = max_texts_per_customer
+        self._topics: Dict[str, Dict[str, set]] = defaultdict(dict)
+
+    def add(self, customer_id: str, topic: str, text: str) -> None:
+        texts = self._topics[customer_id]
+        if text not in texts and len(texts) >= self.max_texts_per_customer:
+            return
+        texts.setdefault(text, set()).add(topic)
+
+    def topics_for(self, customer_id: str, texts: List[str]) -> set:
+        known = self._topics.get(customer_id)
+        if not known:
+            return set()
+        topics = set()
+        for text in texts:
+            topics |= known.get(text, set())
+        return topics
+
+
+# Process-wide, shared by all mutators
+policy_exemptions = PolicyExemptionCache()
+
 
 class GoogleAdsMutator:
     """
     Handles Google Ads Mutations with intelligent Policy Error handling.
     Implements the 'Try-Catch-Exempt' pattern for resilient syncing.
     """
-    def __init__(self, google_ads_client: GoogleAdsClient, customer_id: str):
+    def __init__(self, google_ads_client: GoogleAdsClient, customer_id: str, max_operations: int | None = None):
         self.client = google_ads_client
         self.customer_id = customer_id
+        # Operations per mutate request (API hard limit: 10,000)
+        self.max_operations = max_operations or int(os.getenv("GOOGLE_ADS_MAX_OPERATIONS", 5000))
         
         # Services
         self.campaign_service = self.client.get_service("CampaignService")
         self.ad_group_service = self.client.get_service("AdGroupService")
         self.ad_service = self.client.get_service("AdGroupAdService")
+        self.google_ads_service = self.client.get_service("GoogleAdsService")
+        
+        # Error enums are not exposed on client.enums (it only covers the
+        # googleads.<version>.enums module); resolved once, not per error row
+        self._policy_finding = self.client.get_type("PolicyFindingErrorEnum").PolicyFindingError.POLICY_FINDING
 
     def _create_exemption_policy(self, policy_finding_details) -> List[Any]:
         """
@@ -51,10 +94,15 @@ class GoogleAdsMutator:
         request.operations.append(ad_group_operation)
         return self.ad_group_service.mutate_ad_groups(request=request)
 
-    def sync_rsa_ad(self, ad_operation, attempt=1, max_attempts=3):
+    def sync_rsa_ad(self, ad_operation, attempt=1, max_attempts=2):
         """
         Syncs an RSA Ad with specific "Try-Catch-Exempt" logic for text policies.
+        
+        Known exemptions for this customer are attached up front; on a new
+        policy finding the exemptions are added and the ad is resubmitted once.
         """
+        self._apply_known_exemptions(ad_operation)
+        
         request = self.client.get_type("MutateAdGroupAdsRequest")
         request.customer_id = self.customer_id
         request.operations.append(ad_operation)
@@ -67,30 +115,298 @@ class GoogleAdsMutator:
                 raise ex
 
             # Analyze for Policy Findings
-            ignorable_policy_topics = []
-            has_exemptible_error = False
+            findings = self._exemptible_findings(ex.failure.errors)
+            if findings is None:
+                # Not (only) policy finding errors, re-raise
+                raise ex
+
+            print(f"Policy Violation Detected. Applying {len(findings)} exemptions and Retrying...")
+            self._apply_exemptions(ad_operation, findings)
+            return self.sync_rsa_ad(ad_operation, attempt=attempt+1, max_attempts=max_attempts)
+
+    # --- Batch APIs -------------------------------------------------------
+
+    def sync_campaigns(self, operations: List[Any]) -> List[MutationResult]:
+        """
+        Sends CampaignOperations in as few requests as possible (partial_failure=True).
+        """
+        return self._mutate_in_batches("MutateCampaignsRequest", self.campaign_service.mutate_campaigns, operations)
+
+    def sync_ad_groups(self, operations: List[Any]) -> List[MutationResult]:
+        """
+        Sends AdGroupOperations in as few requests as possible (partial_failure=True).
+        """
+        return self._mutate_in_batches("MutateAdGroupsRequest", self.ad_group_service.mutate_ad_groups, operations)
+
+    def sync_rsa_ads(self, operations: List[Any]) -> List[MutationResult]:
+        """
+        Sends AdGroupAdOperations in as few requests as possible (partial_failure=True).
+        
+        Operation-level Try-Catch-Exempt:
+        1. Exemptions already known for this customer are attached up front.
+        2. Operations that failed only on exemptible policy findings get
+           exemptions attached (by partial-failure error index) and are
+           resubmitted in a single follow-up request. Successful operations
+           are never resent.
+        """
+        for operation in operations:
+            self._apply_known_exemptions(operation)
+        
+        results, errors = self._send_in_batches("MutateAdGroupAdsRequest", self.ad_service.mutate_ad_group_ads, operations)
+        
+        retry_indices = []
+        for index, op_errors in errors.items():
+            findings = self._exemptible_findings(op_errors)
+            if index is None or findings is None:
+                continue
+            self._apply_exemptions(operations[index], findings)
+            retry_indices.append(index)
+        
+        if retry_indices:
+            print(f"Policy Violation Detected. Resubmitting {len(retry_indices)} of {len(operations)} ads with exemptions...")
+            retry_results, _ = self._send_in_batches(
+                "MutateAdGroupAdsRequest",
+                self.ad_service.mutate_ad_group_ads,
+                [operations[i] for i in retry_indices]
+            )
+            for index, retry_result in zip(retry_indices, retry_results):
+                results[index] = MutationResult(
+                    index=index,
+                    resource_name=retry_result.resource_name,
+                    errors=retry_result.errors
+                )
+        
+        return results
+
+    def _mutate_in_batches(self, request_type: str, mutate: Callable, operations: List[Any]) -> List[MutationResult]:
+        results, _ = self._send_in_batches(request_type, mutate, operations)
+        return results
+
+    def _send_in_batches(self, request_type: str, mutate: Callable, operations: List[Any]) -> tuple[List[MutationResult], Dict[int, List[Any]]]:
+        """
+        Chunks operations into requests of max_operations and maps each
+        partial-failure error back to the index of the caller's operation.
+        
+        Returns:
+            Results in operation order, and the raw GoogleAdsErrors per operation index
+        """
+        results = []
+        all_errors = {}
+        for offset in range(0, len(operations), self.max_operations):
+            chunk = operations[offset:offset + self.max_operations]
+            
+            request = self.client.get_type(request_type)
+            request.customer_id = self.customer_id
+            request.operations.extend(chunk)
+            request.partial_failure = True
+            
+            response = mutate(request=request)
+            errors = self._partial_failure_errors(response)
+            
+            for index, op_errors in errors.items():
+                all_errors[None if index is None else offset + index] = op_errors
+            
+            for i, result in enumerate(response.results):
+                op_errors = errors.get(i, [])
+                results.append(MutationResult(
+                    index=offset + i,
+                    resource_name=None if op_errors else result.resource_name,
+                    errors=[e.message for e in op_errors]
+                ))
+        return results, all_errors
 
+    # --- Policy exemptions ----------------------------------------------
+
+    def _exemptible_findings(self, errors) -> List[tuple] | None:
+        """
+        Collects (topic, violating texts) pairs from POLICY_FINDING errors.
+        
+        Returns:
+            The findings, or None if any error is not an exemptible policy finding
+        """
+        findings = []
+        for error in errors:
+            if error.error_code.policy_finding_error != self._policy_finding:
+                return None
+            details = getattr(error.details, "policy_finding_details", None)
+            if not details:
+                return None
+            for entry in details.policy_topic_entries:
+                if entry.type_ == self.client.enums.PolicyTopicEntryTypeEnum.PROHIBITED:
+                    return None
+                texts = [text for evidence in entry.evidences for text in evidence.text_list.texts]
+                findings.append((entry.topic, texts))
+        return findings or None
+
+    def _apply_exemptions(self, operation, findings: List[tuple]) -> None:
+        """
+        Adds ignorable policy topics to the operation and remembers the
+        (topic, text) pairs for this customer.
+        """
+        topics = operation.policy_validation_parameter.ignorable_policy_topics
+        for topic, texts in findings:
+            if topic not in topics:
+                topics.append(topic)
+            for text in texts:
+                policy_exemptions.add(self.customer_id, topic, text)
+
+    def _apply_known_exemptions(self, operation) -> None:
+        ad = operation.create.ad.responsive_search_ad
+        texts = [asset.text for asset in ad.headlines] + [asset.text for asset in ad.descriptions]
+        known = policy_exemptions.topics_for(self.customer_id, texts)
+        
+        topics = operation.policy_validation_parameter.ignorable_policy_topics
+        for topic in sorted(known):
+            if topic not in topics:
+                topics.append(topic)
+
+    def _partial_failure_errors(self, response) -> Dict[int, List[Any]]:
+        """
+        Decodes response.partial_failure_error into {operation index: [GoogleAdsError]}.
+        """
+        status = response.partial_failure_error
+        if not status or not status.code:
+            return {}
+        
+        failure_type = type(self.client.get_type("GoogleAdsFailure"))
+        errors = defaultdict(list)
+        for detail in status.details:
+            failure = failure_type.deserialize(detail.value)
+            for error in failure.errors:
+                errors[self._operation_index(error)].append(error)
+        return errors
+
+    @staticmethod
+    def _operation_index(error) -> int | None:
+        # First path element is the operations list (e.g. operations[3])
+        elements = error.location.field_path_elements
+        return elements[0].index if elements else None
+
+    # --- Atomic campaign graph push -------------------------------------
+
+    def push_campaign_structure(self, structure: CampaignStructure, final_url: str) -> List[MutationResult]:
+        """
+        Creates budget, campaign, ad groups, keywords and RSAs for a generated
+        CampaignStructure in a single atomic GoogleAdsService.mutate call.
+        
+        Returns:
+            One result per MutateOperation. If any result has errors, nothing was applied.
+        """
+        operations = self.build_structure_operations(structure, final_url)
+        return self.mutate_atomic(operations)
+
+    def mutate_atomic(self, mutate_operations: List[Any]) -> List[MutationResult]:
+        """
+        Sends MutateOperations (which may reference each other through
+        temporary resource names) in one all-or-nothing request.
+        """
+        request = self.client.get_type("MutateGoogleAdsRequest")
+        request.customer_id = self.customer_id
+        request.mutate_operations.extend(mutate_operations)
+        
+        try:
+            response = self.google_ads_service.mutate(request=request)
+        except GoogleAdsException as ex:
+            errors = defaultdict(list)
             for error in ex.failure.errors:
-                if error.error_code.policy_finding_error == self.client.enums.PolicyFindingErrorEnum.POLICY_FINDING:
-                     if getattr(error.details, "policy_finding_details", None):
-                        keys = self._create_exemption_policy(error.details.policy_finding_details)
-                        ignorable_policy_topics.extend(keys)
-                        has_exemptible_error = True
-
-            if has_exemptible_error and ignorable_policy_topics:
-                print(f"Policy Violation Detected. Applying {len(ignorable_policy_topics)} exemptions and Retrying...")
-                
-                # Apply exemptions to the operation's policy validation parameter
-                # Note: This sits on the OPERATION.policy_validation_parameter
-                
-                # Ensure the parameter object exists
-                if not ad_operation.policy_validation_parameter:
-                    ad_operation.policy_validation_parameter = self.client.get_type("PolicyValidationParameter")
-                
-                ad_operation.policy_validation_parameter.ignorable_policy_topics.extend(ignorable_policy_topics)
-                
-                # Recursive Retry
-                return self.sync_rsa_ad(ad_operation, attempt=attempt+1, max_attempts=max_attempts)
+                errors[self._operation_index(error)].append(error.message)
+            return [
+                MutationResult(index=i, errors=errors.get(i, []))
+                for i in range(len(mutate_operations))
+            ]
+        
+        results = []
+        for i, op_response in enumerate(response.mutate_operation_responses):
+            result_field = type(op_response).pb(op_response).WhichOneof("response")
+            results.append(MutationResult(
+                index=i,
+                resource_name=getattr(op_response, result_field).resource_name if result_field else None
+            ))
+        return results
+
+    def build_structure_operations(self, structure: CampaignStructure, final_url: str) -> List[Any]:
+        """
+        Builds MutateOperations for a CampaignStructure using temporary
+        (negative) IDs, so children can reference parents in the same request.
+        Campaigns are created PAUSED for review before going live.
+        """
+        enums = self.client.enums
+        paths = self.google_ads_service
+        temp_ids = itertools.count(-1, -1)
+        operations = []
+        
+        # Budget
+        budget_name = paths.campaign_budget_path(self.customer_id, next(temp_ids))
+        op = self.client.get_type("MutateOperation")
+        budget = op.campaign_budget_operation.create
+        budget.resource_name = budget_name
+        budget.name = f"{structure.campaign_name} Budget"
+        # Whole cents: micros must be a multiple of the 10,000 minimum unit
+        budget.amount_micros = round(structure.budget_recommendation * 100) * 10_000
+        budget.delivery_method = enums.BudgetDeliveryMethodEnum.STANDARD
+        budget.explicitly_shared = False
+        operations.append(op)
+        
+        # Campaign
+        campaign_name = paths.campaign_path(self.customer_id, next(temp_ids))
+        op = self.client.get_type("MutateOperation")
+        campaign = op.campaign_operation.create
+        campaign.resource_name = campaign_name
+        campaign.name = structure.campaign_name
+        campaign.advertising_channel_type = enums.AdvertisingChannelTypeEnum.SEARCH
+        campaign.status = enums.CampaignStatusEnum.PAUSED
+        campaign.campaign_budget = budget_name
+        self.client.copy_from(campaign.manual_cpc, self.client.get_type("ManualCpc"))
+        campaign.network_settings.target_google_search = True
+        campaign.network_settings.target_search_network = True
+        operations.append(op)
+        
+        for ag in structure.ad_groups:
+            # Ad Group
+            ad_group_name = paths.ad_group_path(self.customer_id, next(temp_ids))
+            op = self.client.get_type("MutateOperation")
+            ad_group = op.ad_group_operation.create
+            ad_group.resource_name = ad_group_name
+            ad_group.name = ag.name
+            ad_group.campaign = campaign_name
+            ad_group.status = enums.AdGroupStatusEnum.ENABLED
+            ad_group.type_ = enums.AdGroupTypeEnum.SEARCH_STANDARD
+            operations.append(op)
             
-            # If not a policy finding error, re-raise
-            raise ex
+            # Keywords
+            for kw in ag.keywords:
+                op = self.client.get_type("MutateOperation")
+                criterion = op.ad_group_criterion_operation.create
+                criterion.ad_group = ad_group_name
+                criterion.status = enums.AdGroupCriterionStatusEnum.ENABLED
+                criterion.keyword.text = kw.text
+                criterion.keyword.match_type = getattr(
+                    enums.KeywordMatchTypeEnum, kw.match_type.upper(), enums.KeywordMatchTypeEnum.BROAD
+                )
+                operations.append(op)
+            
+            # Responsive Search Ad
+            op = self.client.get_type("MutateOperation")
+            ad_group_ad = op.ad_group_ad_operation.create
+            ad_group_ad.ad_group = ad_group_name
+            ad_group_ad.status = enums.AdGroupAdStatusEnum.ENABLED
+            ad_group_ad.ad.final_urls.append(final_url)
+            rsa = ad_group_ad.ad.responsive_search_ad
+            rsa.headlines.extend(self._text_assets(ag.assets.headlines))
+            rsa.descriptions.extend(self._text_assets(ag.assets.descriptions))
+            if ag.assets.path1:
+                rsa.path1 = ag.assets.path1
+            if ag.assets.path2:
+                rsa.path2 = ag.assets.path2
+            self._apply_known_exemptions(op.ad_group_ad_operation)
+            operations.append(op)
+        
+        return operations
+
+    def _text_assets(self, texts: List[str]) -> List[Any]:
+        assets = []
+        for text in texts:
+            asset = self.client.get_type("AdTextAsset")
+            asset.text = text
+            assets.append(asset)
+        return assets
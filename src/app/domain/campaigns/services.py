@@ -1,171 +1,567 @@
-from typing import List
-from litestar.exceptions import NotFoundException
+import asyncio
+import logging
+import os
+from contextlib import aclosing
+from typing import List, AsyncIterator, Awaitable, Tuple
+from litestar.exceptions import NotFoundException, ValidationException
 
 from app.lib.db.client import ArangoClient
-from app.domain.campaigns.models import Campaign, EntityStatus, CampaignStructure
+from app.lib.db.async_client import AsyncArangoClient, get_async_client
+from app.lib.db.batching import BatchEngine, BatchReport
+from app.domain.campaigns.models import (
+    Campaign, EntityStatus, CampaignStructure, CampaignOutline, AdGroupOutline, AIAdGroup, RSAAsset, GenerationEvent,
+    CampaignTree, CampaignTreePage, CampaignView, CampaignPage, CampaignGraph, GeneratedCampaign
+)
+from app.domain.campaigns.graph import CampaignGraphMaterializer
+from app.lib.db.repository import CampaignRepository
 from arango.database import StandardDatabase
 import msgspec
 
+
+logger = logging.getLogger(__name__)
+
+# Upsert-Merge of Google campaigns; protects locally edited (is_dirty) fields
+SYNC_CAMPAIGNS_AQL = """
+FOR doc IN @batch
+  UPSERT { _key: doc._key }
+  INSERT MERGE(doc, {
+      first_synced_at: DATE_NOW(),
+      local_status: "clean",
+      is_dirty: false,
+      sync_status: "synced"
+  })
+  UPDATE MERGE(doc, {
+      last_synced_at: DATE_NOW(),
+      
+      # 1. Preserve local metadata
+      internal_notes: OLD.internal_notes,
+      
+      # 2. Protect Dirty Fields (Local Wins)
+      name: OLD.is_dirty ? OLD.name : doc.name,
+      status: OLD.is_dirty ? OLD.status : doc.status,
+      
+      # 3. Always update read-only fields
+      serving_status: doc.serving_status,
+      sync_status: "synced"
+  })
+  IN Campaigns
+  RETURN OLD == null ? "inserted" : (OLD.is_dirty ? "dirty_protected" : "updated")
+"""
+
+
+# Report import: ad group prompts get the outline summary; without one, this much of the report
+REPORT_SUMMARY_FALLBACK_CHARS = 2000
+
+
+# AdsGraph levels: 1 campaigns, 2 ad groups, 3 ads/keywords, 4 ad asset links
+CAMPAIGN_TREE_MAX_DEPTH = 4
+
+# Campaign attributes that may be requested via projection
+CAMPAIGN_TREE_FIELDS = frozenset(field.encode_name for field in msgspec.structs.fields(CampaignView))
+
+
+def build_campaign_list_query(paginate: bool = True) -> str:
+    """
+    Filtered campaign listing in _key order with server-side projection.
+    
+    Bind vars: @customer_id, @status, @is_dirty (null = no filter), @fields
+    (projection or null), @cursor (last _key of the previous page) and
+    @limit when paginated.
+    """
+    limit = "LIMIT @limit" if paginate else ""
+    return f"""
+    FOR c IN Campaigns
+        FILTER @customer_id == null OR c.customer_id == @customer_id
+        FILTER @status == null OR c.status == @status
+        FILTER @is_dirty == null OR c.is_dirty == @is_dirty
+        FILTER @cursor == null OR c._key > @cursor
+        SORT c._key
+        {limit}
+        RETURN @fields == null ? c : KEEP(c, APPEND(@fields, ["_key"]))
+    """
+
+
+def _asset_links_aql(vertex: str, field_type: str | None = None) -> str:
+    type_filter = f'FILTER link.field_type == "{field_type}"' if field_type else ""
+    return f"""(
+        FOR asset, link IN 1..1 OUTBOUND {vertex} uses_asset
+            {type_filter}
+            SORT link._key
+            RETURN {{
+                asset_text: asset.text,
+                asset_id: asset._id,
+                field_type: link.field_type,
+                pinned_field: link.pinned_field,
+                performance_label: link.performance_label
+            }}
+    )"""
+
+
+def build_campaign_tree_query(depth: int, single: bool = False) -> str:
+    """
+    Builds one AQL query returning campaigns with their AdsGraph subtree.
+    
+    Each level is a nested traversal subquery, so a page of trees is a
+    single round-trip regardless of its size. Levels below `depth` are
+    not part of the query at all.
+    
+    Bind vars: @fields (projection or null), and either @key (single) or
+    @customer_id, @cursor, @limit (page, keyset on _key).
+    """
+    if single:
+        selection = "FILTER c._key == @key"
+    else:
+        selection = """FILTER @customer_id == null OR c.customer_id == @customer_id
+        FILTER @cursor == null OR c._key > @cursor
+        SORT c._key
+        LIMIT @limit"""
+    
+    ad_groups = "[]"
+    if depth >= 2:
+        children = ""
+        if depth >= 3:
+            ad_assets = ""
+            if depth >= 4:
+                ad_assets = f""",
+                        headlines: {_asset_links_aql("ad", "HEADLINE")},
+                        descriptions: {_asset_links_aql("ad", "DESCRIPTION")}"""
+            children = f""", {{
+                ads: (
+                    FOR ad IN 1..1 OUTBOUND ag adgroup_ad
+                        SORT ad._key
+                        RETURN MERGE({{ final_urls: [], type: "RESPONSIVE_SEARCH_AD" }}, ad, {{
+                            ad_group_id: ag._id{ad_assets}
+                        }})
+                ),
+                keywords: (
+                    FOR kw IN 1..1 OUTBOUND ag adgroup_keyword
+                        SORT kw._key
+                        RETURN kw
+                ),
+                assets: {_asset_links_aql("ag")}
+            }}"""
+        ad_groups = f"""(
+            FOR ag IN 1..1 OUTBOUND c campaign_adgroup
+                SORT ag._key
+                RETURN MERGE(ag{children})
+        )"""
+    
+    return f"""
+    FOR c IN Campaigns
+        {selection}
+        RETURN MERGE(
+            @fields == null ? c : KEEP(c, APPEND(@fields, ["_key", "_id"])),
+            {{ ad_groups: {ad_groups} }}
+        )
+    """
+
+
 class CampaignService:
-    def __init__(self, db: StandardDatabase):
+    def __init__(self, db: StandardDatabase, client: AsyncArangoClient | None = None):
         self.db = db
         self.collection = self.db.collection("Campaigns")
+        self._client = client
+
+    @property
+    def client(self) -> AsyncArangoClient:
+        """
+        Non-blocking query path (rows decoded straight from the response bytes).
+        """
+        if self._client is None:
+            self._client = get_async_client()
+        return self._client
 
     async def get_all(self) -> List[Campaign]:
-        cursor = self.collection.all()
-        return [msgspec.convert(doc, type=Campaign) for doc in cursor]
+        return await self.client.query("FOR c IN Campaigns RETURN c", Campaign)
+
+    async def list_campaigns(
+        self,
+        customer_id: str | None = None,
+        status: EntityStatus | None = None,
+        is_dirty: bool | None = None,
+        fields: List[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100
+    ) -> CampaignPage:
+        """
+        Keyset-paginated campaign list.
+        
+        Args:
+            customer_id, status, is_dirty: Optional filters
+            fields: Campaign attributes to return (projection); all if omitted
+            cursor: next_cursor of the previous page
+            limit: Page size
+        """
+        bind_vars = self._list_bind_vars(customer_id, status, is_dirty, fields, cursor)
+        bind_vars["limit"] = limit + 1
+        query = build_campaign_list_query()
+        docs = await self.client.query(query, CampaignView, bind_vars)
+        
+        items = docs[:limit]
+        next_cursor = items[-1]._key if len(docs) > limit else None
+        return CampaignPage(items=items, next_cursor=next_cursor)
+
+    async def stream_campaigns(
+        self,
+        customer_id: str | None = None,
+        status: EntityStatus | None = None,
+        is_dirty: bool | None = None,
+        fields: List[str] | None = None,
+        cursor: str | None = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[msgspec.Raw]:
+        """
+        Yields matching campaign documents batch by batch from an ArangoDB
+        cursor; at most one batch is held in memory.
+        """
+        bind_vars = self._list_bind_vars(customer_id, status, is_dirty, fields, cursor)
+        query = build_campaign_list_query(paginate=False)
+        # Rows stay undecoded JSON (msgspec.Raw) and are written to the response as-is
+        # Closing the cursor generator deletes the server-side cursor if the
+        # client goes away mid-stream
+        async with aclosing(self.client.cursor(query, msgspec.Raw, bind_vars, batch_size)) as rows:
+            async for row in rows:
+                yield row
+
+    def _list_bind_vars(self, customer_id, status, is_dirty, fields, cursor) -> dict:
+        return {
+            "customer_id": customer_id,
+            "status": status.value if isinstance(status, EntityStatus) else status,
+            "is_dirty": is_dirty,
+            "fields": self._tree_fields(fields),
+            "cursor": cursor
+        }
+
+    async def get_campaign_trees(
+        self,
+        customer_id: str | None = None,
+        depth: int = 2,
+        fields: List[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 50
+    ) -> CampaignTreePage:
+        """
+        Campaigns with their hierarchy down to `depth`, one query per page.
+        
+        Args:
+            customer_id: Only campaigns of this customer
+            depth: 1 campaigns, 2 ad groups, 3 ads and keywords, 4 ad asset links
+            fields: Campaign attributes to return (projection); all if omitted
+            cursor: next_cursor of the previous page
+            limit: Page size
+        """
+        query = build_campaign_tree_query(self._tree_depth(depth))
+        bind_vars = {
+            "fields": self._tree_fields(fields),
+            "customer_id": customer_id,
+            "cursor": cursor,
+            # One extra row tells whether another page exists
+            "limit": limit + 1
+        }
+        docs = await self.client.query(query, CampaignTree, bind_vars)
+        
+        items = docs[:limit]
+        next_cursor = items[-1]._key if len(docs) > limit else None
+        return CampaignTreePage(items=items, next_cursor=next_cursor)
+
+    async def get_campaign_tree(
+        self,
+        campaign_key: str,
+        depth: int = CAMPAIGN_TREE_MAX_DEPTH,
+        fields: List[str] | None = None
+    ) -> CampaignTree:
+        """
+        One campaign with its hierarchy down to `depth`.
+        
+        Raises:
+            NotFoundException: If the campaign does not exist
+        """
+        query = build_campaign_tree_query(self._tree_depth(depth), single=True)
+        bind_vars = {"fields": self._tree_fields(fields), "key": campaign_key}
+        docs = await self.client.query(query, CampaignTree, bind_vars)
+        if not docs:
+            raise NotFoundException(f"Campaign {campaign_key} not found")
+        return docs[0]
+
+    @staticmethod
+    def _tree_depth(depth: int) -> int:
+        if not 1 <= depth <= CAMPAIGN_TREE_MAX_DEPTH:
+            raise ValidationException(f"depth must be between 1 and {CAMPAIGN_TREE_MAX_DEPTH}")
+        return depth
 
-    async def sync_campaigns_batch(self, campaigns: List[dict]):
+    @staticmethod
+    def _tree_fields(fields: List[str] | None) -> List[str] | None:
+        if not fields:
+            return None
+        unknown = set(fields) - CAMPAIGN_TREE_FIELDS
+        if unknown:
+            raise ValidationException(f"Unknown campaign fields: {', '.join(sorted(unknown))}")
+        return list(fields)
+
+    async def sync_campaigns_batch(self, campaigns: List[dict], engine: BatchEngine | None = None) -> BatchReport:
         """
         Implements the AQL Upsert-Merge pattern to sync from Google.
         Preserves local modifications (is_dirty=True).
+        
+        The batch is split into chunks that run in parallel (see BatchEngine);
+        only failed chunks are retried.
+        
+        Returns:
+            Per-chunk counts of inserted, updated, dirty-protected and failed documents
         """
-        aql = """
-        FOR doc IN @batch
-          UPSERT { _key: doc._key }
-          INSERT MERGE(doc, {
-              first_synced_at: DATE_NOW(),
-              local_status: "clean",
-              is_dirty: false,
-              sync_status: "synced"
-          })
-          UPDATE MERGE(doc, {
-              last_synced_at: DATE_NOW(),
-              
-              # 1. Preserve local metadata
-              internal_notes: OLD.internal_notes,
-              
-              # 2. Protect Dirty Fields (Local Wins)
-              name: OLD.is_dirty ? OLD.name : doc.name,
-              status: OLD.is_dirty ? OLD.status : doc.status,
-              
-              # 3. Always update read-only fields
-              serving_status: doc.serving_status,
-              sync_status: "synced"
-          })
-          IN Campaigns
-        """
-        
-        # Execute Batch Transaction
-        self.db.aql.execute(aql, bind_vars={"batch": campaigns})
-
-    async def generate_campaign_structure_from_inputs(self, landing_page_url: str, keywords: List[str]) -> CampaignStructure:
+        async def _execute(chunk):
+            return await self.client.query(SYNC_CAMPAIGNS_AQL, str, {"batch": chunk})
+        
+        # Execute chunked batch transactions
+        engine = engine or BatchEngine()
+        return await engine.run(campaigns, _execute, label="campaigns")
+
+    async def generate_campaign_structure_from_inputs(self, landing_page_url: str, keywords: List[str], bypass_cache: bool = False) -> GeneratedCampaign:
         """
         Generates a Campaign Structure directly from inputs (Wizard Mode).
         """
         from app.lib.ai.client import GeminiService
-        from app.domain.campaigns.models import CampaignStructure
         from app.lib.ai.schema_bridge import prepare_schema_for_gemini
         
         gemini = GeminiService()
         schema = prepare_schema_for_gemini(CampaignStructure)
+        prompt = self._build_wizard_prompt(landing_page_url, keywords)
         
-        prompt = f"""
-        You are a Google Ads Expert. Create a high-performing Campaign Structure
-        for the following Landing Page and Keywords.
+        structure_dict = await gemini.generate_with_retry(prompt, schema, bypass_cache=bypass_cache)
+        structure = msgspec.convert(structure_dict, type=CampaignStructure)
         
-        Landing Page: {landing_page_url}
-        Target Keywords: {", ".join(keywords)}
+        # Persist
+        graph = await self._persist_structure(structure)
         
-        Requirements:
-        1. Create 1 optimized Ad Group.
-        2. Generate 15 Headlines (max 30 chars).
-        3. Generate 4 Descriptions (max 90 chars).
-        4. Suggest a Campaign Name and Budget.
+        return self._generated(structure, graph)
+
+    async def stream_campaign_structure_from_inputs(self, landing_page_url: str, keywords: List[str], bypass_cache: bool = False) -> AsyncIterator[GenerationEvent]:
         """
+        Streaming variant of generate_campaign_structure_from_inputs.
+        Yields progress events while Gemini generates; the campaign is
+        persisted once, after all ad groups were emitted.
+        """
+        from app.lib.ai.client import GeminiService
+        from app.lib.ai.schema_bridge import prepare_schema_for_gemini
         
-        structure_dict = await gemini.generate_with_retry(prompt, schema)
-        structure = msgspec.json.decode(msgspec.json.encode(structure_dict), type=CampaignStructure)
+        gemini = GeminiService()
+        schema = prepare_schema_for_gemini(CampaignStructure)
+        prompt = self._build_wizard_prompt(landing_page_url, keywords)
         
-        # Persist
-        await self._persist_structure(structure)
+        yield GenerationEvent(stage="prompt_sent")
+        chunks = []
+        received = 0
+        async for chunk in gemini.stream_structured(prompt, schema, bypass_cache=bypass_cache):
+            chunks.append(chunk)
+            received += len(chunk)
+            yield GenerationEvent(stage="tokens_received", received_chars=received)
+        
+        structure = msgspec.json.decode("".join(chunks), type=CampaignStructure)
+        yield GenerationEvent(stage="validated")
         
-        return structure
+        for ag in structure.ad_groups:
+            yield GenerationEvent(stage="ad_group", ad_group=ag)
+        
+        graph = await self._persist_structure(structure)
+        yield GenerationEvent(stage="persisted", campaign_id=graph.campaign_key)
+        yield GenerationEvent(stage="complete", structure=self._generated(structure, graph), campaign_id=graph.campaign_key)
 
-    async def generate_campaign_from_report(self, report_text: str, customer_id: str) -> CampaignStructure:
+    async def generate_campaign_from_report(self, report_text: str, customer_id: str) -> GeneratedCampaign:
         """
         Parses a Deep Research Report using Gemini and persists the resulting
-        Campaign Structure (Campaign -> AdGroups -> Assets) to ArangoDB.
+        Campaign Structure (Campaign -> AdGroups -> Keywords/Assets) to ArangoDB.
+        
+        Two-phase pipeline:
+        1. A small structural call extracts the campaign outline (ad groups + keywords).
+        2. RSA assets are generated per ad group concurrently (bounded fan-out,
+           retried per group) and merged back into the CampaignStructure;
+           groups that keep failing are listed in failed_ad_groups.
         """
         from app.lib.ai.client import GeminiService
-        from app.domain.campaigns.models import CampaignStructure
         from app.lib.ai.schema_bridge import prepare_schema_for_gemini
         
-        # 1. Call AI to parse report
-        # DEBUG: print(f"Starting Campaign Generation from Report. Length: {len(report_text)} chars")
+        # 1. Call AI to extract the campaign outline
         gemini = GeminiService()
-        schema = prepare_schema_for_gemini(CampaignStructure)
+        schema = prepare_schema_for_gemini(CampaignOutline)
+        prompt = self._build_outline_prompt(report_text)
+        
+        outline_dict = await gemini.generate_with_retry(prompt, schema)
+        outline = msgspec.convert(outline_dict, type=CampaignOutline)
+        
+        # 2. Generate RSA assets per ad group in parallel
+        results = await asyncio.gather(*self._ad_group_jobs(gemini, outline, report_text))
+        ad_groups = [ag for _, ag in results if ag is not None]
+        failed = [group.name for group, ag in results if ag is None]
+        if not ad_groups:
+            raise ValueError("Asset generation failed for every ad group")
+        
+        structure = self._structure_from_outline(outline, ad_groups)
+
+        # 3. Persist
+        graph = await self._persist_structure(structure, customer_id)
+        
+        return self._generated(structure, graph, failed)
+
+    async def stream_campaign_from_report(self, report_text: str, customer_id: str) -> AsyncIterator[GenerationEvent]:
+        """
+        Streaming variant of generate_campaign_from_report.
+        Ad groups are emitted in completion order; the campaign is persisted
+        once, after the last one.
+        """
+        from app.lib.ai.client import GeminiService
+        from app.lib.ai.schema_bridge import prepare_schema_for_gemini
+        
+        gemini = GeminiService()
+        schema = prepare_schema_for_gemini(CampaignOutline)
+        prompt = self._build_outline_prompt(report_text)
+        
+        yield GenerationEvent(stage="prompt_sent")
+        chunks = []
+        received = 0
+        async for chunk in gemini.stream_structured(prompt, schema):
+            chunks.append(chunk)
+            received += len(chunk)
+            yield GenerationEvent(stage="tokens_received", received_chars=received)
+        
+        outline = msgspec.json.decode("".join(chunks), type=CampaignOutline)
+        yield GenerationEvent(stage="validated", message=f"{len(outline.ad_groups)} ad groups")
+        
+        ad_groups = []
+        failed = []
+        # Explicit tasks, so Gemini calls still running when the client
+        # disconnects (or the generator is closed) can be cancelled
+        tasks = [asyncio.ensure_future(job) for job in self._ad_group_jobs(gemini, outline, report_text)]
+        try:
+            for job in asyncio.as_completed(tasks):
+                group, ag = await job
+                if ag is None:
+                    failed.append(group.name)
+                    yield GenerationEvent(stage="ad_group_failed", message=group.name)
+                    continue
+                ad_groups.append(ag)
+                yield GenerationEvent(stage="ad_group", ad_group=ag)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if not ad_groups:
+            raise ValueError("Asset generation failed for every ad group")
+        
+        structure = self._structure_from_outline(outline, ad_groups)
+        graph = await self._persist_structure(structure, customer_id)
+        yield GenerationEvent(stage="persisted", campaign_id=graph.campaign_key)
+        yield GenerationEvent(stage="complete", structure=self._generated(structure, graph, failed), campaign_id=graph.campaign_key)
+
+    def _ad_group_jobs(self, gemini, outline: CampaignOutline, report_text: str) -> List[Awaitable[Tuple[AdGroupOutline, AIAdGroup | None]]]:
+        """
+        Builds one generate_rsa_assets job per outline ad group.
+        
+        Each prompt carries the group's focus plus the outline's campaign
+        summary, not the full report, so token cost does not grow with
+        report size times group count. Concurrency is capped by
+        REPORT_AD_GROUP_FANOUT (on top of the global Gemini limit).
         
-        prompt = f"""
+        Each group gets up to REPORT_AD_GROUP_ATTEMPTS attempts on any error
+        (tenacity inside generate_with_retry only covers invalid output and
+        timeouts, not 429/5xx); retries bypass the cache. A group that keeps
+        failing resolves to (group, None) instead of failing the whole
+        campaign.
+        """
+        slots = asyncio.Semaphore(int(os.getenv("REPORT_AD_GROUP_FANOUT", 5)))
+        max_attempts = int(os.getenv("REPORT_AD_GROUP_ATTEMPTS", 2))
+        # Outline without a summary: fall back to the start of the report
+        summary = outline.summary or report_text[:REPORT_SUMMARY_FALLBACK_CHARS]
+        
+        async def _generate(group: AdGroupOutline) -> Tuple[AdGroupOutline, AIAdGroup | None]:
+            context = f"Ad Group: {group.name}\n"
+            if group.focus:
+                context += f"Focus: {group.focus}\n"
+            context += f"Campaign Summary:\n{summary}"
+            
+            for attempt in range(1, max_attempts + 1):
+                async with slots:
+                    try:
+                        assets = await gemini.generate_rsa_assets(
+                            target_keywords=[kw.text for kw in group.keywords],
+                            language=outline.language,
+                            context=context,
+                            bypass_cache=attempt > 1
+                        )
+                    except Exception as e:
+                        logger.warning("Ad group '%s' failed (attempt %d/%d): %s", group.name, attempt, max_attempts, e)
+                        continue
+                return group, AIAdGroup(
+                    name=group.name,
+                    keywords=group.keywords,
+                    assets=msgspec.convert(assets, type=RSAAsset)
+                )
+            return group, None
+        
+        return [_generate(group) for group in outline.ad_groups]
+
+    @staticmethod
+    def _generated(structure: CampaignStructure, graph: CampaignGraph, failed_ad_groups: List[str] | None = None) -> GeneratedCampaign:
+        return GeneratedCampaign(
+            **msgspec.structs.asdict(structure),
+            campaign_id=graph.campaign_key,
+            failed_ad_groups=failed_ad_groups or []
+        )
+
+    @staticmethod
+    def _structure_from_outline(outline: CampaignOutline, ad_groups: List[AIAdGroup]) -> CampaignStructure:
+        return CampaignStructure(
+            campaign_name=outline.campaign_name,
+            budget_recommendation=outline.budget_recommendation,
+            ad_groups=ad_groups,
+            language=outline.language,
+            target_locations=outline.target_locations
+        )
+
+    @staticmethod
+    def _build_wizard_prompt(landing_page_url: str, keywords: List[str]) -> str:
+        return f"""
+        You are a Google Ads Expert. Create a high-performing Campaign Structure
+        for the following Landing Page and Keywords.
+        
+        Landing Page: {landing_page_url}
+        Target Keywords: {", ".join(keywords)}
+        
+        Requirements:
+        1. Create 1 optimized Ad Group.
+        2. Generate 15 Headlines (max 30 chars).
+        3. Generate 4 Descriptions (max 90 chars).
+        4. Suggest a Campaign Name and Budget.
+        """
+
+    @staticmethod
+    def _build_outline_prompt(report_text: str) -> str:
+        return f"""
         You are an expert Google Ads Strategist.
         
         TASK:
-        Analyze the provided "Deep Research Report" and construct a complete Google Ads Campaign Structure.
+        Analyze the provided "Deep Research Report" and construct the outline of a Google Ads Campaign.
         
         INSTRUCTIONS:
         1. Identify the logical segments in the report (e.g., Target Audiences, Product Angles) and create separate Ad Groups for each.
         2. For each Ad Group, extract or generate highly relevant Keywords (Broad/Phrase/Exact).
-        3. For each Ad Group, extract or write 15 High-Quality Headlines (max 30 chars) and 4 Descriptions (max 90 chars).
+        3. For each Ad Group, summarize its angle in one sentence (focus).
         4. If the report suggests a budget, use it; otherwise estimate a recommended daily budget.
+        5. Summarize what the ads need to know from the report (offer, audience, key selling
+           points, tone) in at most 5 sentences (summary).
+        Do NOT write headlines or descriptions yet.
         
         REPORT CONTENT:
         {report_text}
         """
-        
-        # DEBUG: print("Sending request to Gemini...")
-        structure_dict = await gemini.generate_with_retry(prompt, schema)
-        # DEBUG: print("Received response from Gemini. Decoding...")
-        structure = msgspec.json.decode(msgspec.json.encode(structure_dict), type=CampaignStructure)
-        # DEBUG: print(f"Successfully decoded structure. Found {len(structure.ad_groups)} Ad Groups.")
 
-        # 2. Persist
-        # DEBUG: print("Persisting structure to ArangoDB...")
-        await self._persist_structure(structure)
-        # DEBUG: print("Persistence complete.")
-        
-        return structure
-
-    async def _persist_structure(self, structure: CampaignStructure):
-        """
-        Helper to persist a CampaignStructure to ArangoDB using the Repository.
+    async def _persist_structure(self, structure: CampaignStructure, customer_id: str | None = None) -> CampaignGraph:
         """
-        from app.domain.assets.services import AssetService
-        from app.domain.assets.models import AssetType
-        from app.lib.db.repository import CampaignRepository
-        
-        # DEBUG: print("Starting _persist_structure...")
-        repo = CampaignRepository(self.db)
+        Persists the whole structure (campaign, ad groups, keywords, assets
+        and their edges) as AdsGraph documents in one transaction, as a new
+        generated campaign.
         
-        # Use dict for deduplication (hash -> asset data)
-        unique_assets = {}
-        links_batch = []
-        
-        for ag in structure.ad_groups:
-            # Headlines
-            for hl in ag.assets.headlines:
-                h_hash = AssetService.generate_asset_hash(hl, AssetType.TEXT)
-                # Only add if not already seen (deduplication)
-                if h_hash not in unique_assets:
-                    unique_assets[h_hash] = {
-                        "hash": h_hash,
-                        "text": hl,
-                        "type": AssetType.TEXT
-                    }
-                
-            # Descriptions
-            for desc in ag.assets.descriptions:
-                d_hash = AssetService.generate_asset_hash(desc, AssetType.TEXT)
-                if d_hash not in unique_assets:
-                    unique_assets[d_hash] = {
-                        "hash": d_hash,
-                        "text": desc,
-                        "type": AssetType.TEXT
-                    }
-        
-        # Convert back to list
-        assets_batch = list(unique_assets.values())
-        # DEBUG: print(f"Deduplicated {len(assets_batch)} unique assets for persistence.")
-        
-        # Batch Upsert to ArangoDB
-        await repo.batch_upsert_assets(assets_batch, links_batch)
-        # DEBUG: print("Batch upsert complete.")
+        The campaign can be re-opened with get_campaign_tree(graph.campaign_key)
+        (see app.domain.campaigns.graph for the key scheme).
+        """
+        repo = CampaignRepository(self.db, self.client)
+        return await CampaignGraphMaterializer(repo).materialize(structure, customer_id)
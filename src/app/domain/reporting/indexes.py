@@ -0,0 +1,8 @@
+# Index declarations for reporting data (see app.lib.db.indexes).
+from app.lib.db.indexes import IndexSpec
+
+
+INDEXES = [
+    IndexSpec(collection="DailyStats", name="idx_stats_entity_date", fields=("entity_id", "date")),
+    IndexSpec(collection="DailyStats", name="idx_stats_customer_date", fields=("customer_id", "date")),
+]
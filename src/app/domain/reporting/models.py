@@ -1,6 +1,15 @@
 import msgspec
+import time
+from app.domain.shared.models import ArangoDocument
 
 class SearchTermRow(msgspec.Struct):
+    """
+    One search term report row, shaped as its DailyStats document.
+    """
+    _key: str  # SearchTermIngestionService.stat_key
+    customer_id: str
+    entity_id: str  # AdGroups/{ad_group_id}
+    date: str  # YYYY-MM-DD (segments.date)
     search_term: str
     status: str
     keyword: str
@@ -8,3 +17,35 @@ class SearchTermRow(msgspec.Struct):
     impressions: int
     cost_micros: int
     conversions: float
+    entity_type: str = "search_term"
+
+class IngestionStats(msgspec.Struct):
+    """
+    Result of a bulk report ingestion into DailyStats.
+    """
+    customer_id: str
+    rows: int = 0
+    chunks: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: int = 0
+
+class SyncWatermark(ArangoDocument):
+    """
+    Incremental sync position per customer and resource.
+    Documents in 'SyncWatermarks' (_key: "{customer_id}_{resource}").
+    """
+    customer_id: str
+    resource: str
+    watermark: str  # YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS' (change_status)
+    updated_at: float = msgspec.field(default_factory=time.time)
+
+class SyncResult(msgspec.Struct):
+    """
+    Outcome of one incremental sync run.
+    """
+    customer_id: str
+    resource: str
+    full_sync: bool
+    rows: int
+    watermark: str
@@ -1,3 +1,25 @@
+import asyncio
+import hashlib
+import os
+from datetime import date, datetime, timedelta
+from typing import Iterator, List
+from zoneinfo import ZoneInfo
+import msgspec
+
+from arango.database import StandardDatabase
+from arango.exceptions import DocumentInsertError
+from arango.request import Request
+from arango.response import Response
+from app.domain.reporting.models import SearchTermRow, IngestionStats, SyncResult
+from app.lib.db.repository import SyncWatermarkRepository
+
+
+_import_encoder = msgspec.json.Encoder()
+
+# change_status timestamps ('YYYY-MM-DD HH:MM:SS', account time zone)
+CHANGE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
 class GAQLService:
     """
     Builder for Google Ads Query Language (GAQL).
@@ -5,30 +27,52 @@ class GAQLService:
     """
     
     @staticmethod
-    def build_search_term_query(lookback_days: int = 30) -> str:
+    def build_search_term_query(lookback_days: int = 30, start_date: str | None = None, end_date: str | None = None) -> str:
         """
         Constructs the high-volume search term view query.
+        
+        If start_date/end_date (YYYY-MM-DD) are given, the explicit range is
+        used instead of the LAST_N_DAYS window (incremental sync).
         """
+        if start_date and end_date:
+            date_filter = f"segments.date BETWEEN '{start_date}' AND '{end_date}'"
+        else:
+            date_filter = f"segments.date DURING LAST_{lookback_days}_DAYS"
+        
         return f"""
         SELECT
             search_term_view.search_term,
             search_term_view.status,
             segments.keyword.info.text,
+            segments.date,
+            ad_group.id,
             metrics.clicks,
             metrics.impressions,
             metrics.cost_micros,
             metrics.conversions
         FROM search_term_view
-        WHERE segments.date DURING LAST_{lookback_days}_DAYS
+        WHERE {date_filter}
           AND metrics.impressions > 0
         """
 
     @staticmethod
-    def build_campaign_sync_query() -> str:
+    def build_campaign_sync_query(campaign_ids: List[str] | None = None) -> str:
         """
         Query for syncing Campaign structure (No segments).
+        
+        A full sync skips REMOVED campaigns. When restricted to changed
+        campaigns the status filter is dropped, so a campaign removed inside
+        the sync window comes back with status REMOVED and is updated locally.
+        
+        Args:
+            campaign_ids: Restrict to these campaigns (incremental sync)
         """
-        return """
+        if campaign_ids:
+            where = f"campaign.id IN ({', '.join(campaign_ids)})"
+        else:
+            where = 'campaign.status != "REMOVED"'
+        
+        return f"""
         SELECT
             campaign.id,
             campaign.name,
@@ -38,5 +82,270 @@ class GAQLService:
             campaign.end_date,
             campaign.serving_status
         FROM campaign
-        WHERE campaign.status != "REMOVED"
+        WHERE {where}
+        """
+
+    @staticmethod
+    def build_campaign_change_query(since: str, until: str, limit: int = 10000) -> str:
+        """
+        change_status query for campaigns modified in [since, until].
+        
+        The API requires both bounds (max. 90 days back) and a LIMIT.
+        Timestamps use the 'YYYY-MM-DD HH:MM:SS' format.
+        """
+        return f"""
+        SELECT
+            change_status.resource_name,
+            change_status.campaign,
+            change_status.last_change_date_time
+        FROM change_status
+        WHERE change_status.resource_type = 'CAMPAIGN'
+          AND change_status.last_change_date_time BETWEEN '{since}' AND '{until}'
+        ORDER BY change_status.last_change_date_time
+        LIMIT {limit}
+        """
+
+
+class SearchTermIngestionService:
+    """
+    Streams the search term report of a customer into DailyStats.
+    
+    Rows are read batch by batch from GoogleAdsService.search_stream, decoded
+    straight into SearchTermRow structs (already shaped as DailyStats
+    documents) and written in chunked bulk imports, so memory stays bounded
+    by the chunk size regardless of account size.
+    """
+    def __init__(self, db: StandardDatabase, google_ads_client, chunk_size: int | None = None):
+        self.db = db
+        self.client = google_ads_client
+        self.chunk_size = chunk_size or int(os.getenv("STATS_IMPORT_CHUNK_SIZE", 5000))
+        self.collection = self.db.collection("DailyStats")
+
+    def ingest(self, customer_id: str, lookback_days: int = 30) -> IngestionStats:
+        """
+        Blocking (gRPC + HTTP); run from a worker via asyncio.to_thread.
+        """
+        query = GAQLService.build_search_term_query(lookback_days)
+        return self.ingest_rows(customer_id, self.stream_rows(customer_id, query))
+
+    def ingest_rows(self, customer_id: str, rows: Iterator[SearchTermRow]) -> IngestionStats:
+        stats = IngestionStats(customer_id=customer_id)
+        chunk: List[SearchTermRow] = []
+        
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._flush(customer_id, chunk, stats)
+                chunk = []
+        
+        if chunk:
+            self._flush(customer_id, chunk, stats)
+        
+        return stats
+
+    def stream_rows(self, customer_id: str, query: str) -> Iterator[SearchTermRow]:
         """
+        Decodes search_stream batches into SearchTermRow structs.
+        """
+        ga_service = self.client.get_service("GoogleAdsService")
+        stream = ga_service.search_stream(customer_id=customer_id, query=query)
+        
+        for batch in stream:
+            for row in batch.results:
+                metrics = row.metrics
+                ad_group_id = str(row.ad_group.id)
+                search_term = row.search_term_view.search_term
+                keyword = row.segments.keyword.info.text
+                day = row.segments.date
+                yield SearchTermRow(
+                    _key=self.stat_key(customer_id, ad_group_id, day, keyword, search_term),
+                    customer_id=customer_id,
+                    entity_id=f"AdGroups/{ad_group_id}",
+                    date=day,
+                    search_term=search_term,
+                    status=row.search_term_view.status.name,
+                    keyword=keyword,
+                    clicks=metrics.clicks,
+                    impressions=metrics.impressions,
+                    cost_micros=metrics.cost_micros,
+                    conversions=metrics.conversions
+                )
+
+    def _flush(self, customer_id: str, chunk: List[SearchTermRow], stats: IngestionStats) -> None:
+        # Collection.import_bulk needs one dict per row; post the structs
+        # msgspec-encoded straight to the import endpoint instead
+        request = Request(
+            method="post",
+            endpoint="/_api/import",
+            data=_import_encoder.encode(chunk).decode("utf-8"),
+            params={"type": "list", "collection": self.collection.name, "onDuplicate": "update", "complete": False},
+            write=self.collection.name
+        )
+        
+        def response_handler(resp: Response) -> dict:
+            if resp.is_success:
+                return resp.body
+            raise DocumentInsertError(resp, request)
+        
+        result = self.collection._execute(request, response_handler)
+        stats.rows += len(chunk)
+        stats.chunks += 1
+        stats.created += result.get("created", 0)
+        stats.updated += result.get("updated", 0)
+        stats.errors += result.get("errors", 0)
+
+    @staticmethod
+    def stat_key(customer_id: str, ad_group_id: str, day: str, keyword: str, search_term: str) -> str:
+        """
+        Deterministic _key so re-imports of the same day update in place.
+        """
+        payload = f"{customer_id}|{ad_group_id}|{day}|{keyword}|{search_term}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class IncrementalSyncService:
+    """
+    Watermark-based Google Ads sync.
+    
+    Per customer and resource a watermark is stored in ArangoDB
+    (SyncWatermarks). Search terms are re-queried only from the watermark
+    minus a restatement window (late conversions); campaigns are re-queried
+    only if change_status reports a modification since the last sync.
+    """
+    SEARCH_TERMS = "search_term_view"
+    CAMPAIGNS = "campaign"
+    
+    def __init__(self, db: StandardDatabase, google_ads_client):
+        self.db = db
+        self.client = google_ads_client
+        self.watermarks = SyncWatermarkRepository(db)
+        self.restatement_days = int(os.getenv("SYNC_RESTATEMENT_DAYS", 3))
+        self.initial_lookback_days = int(os.getenv("SYNC_INITIAL_LOOKBACK_DAYS", 30))
+        self.change_overlap_seconds = int(os.getenv("SYNC_CHANGE_OVERLAP_SECONDS", 300))
+        self.change_page_size = int(os.getenv("SYNC_CHANGE_PAGE_SIZE", 10000))
+
+    def sync_search_terms(self, customer_id: str) -> SyncResult:
+        """
+        Blocking; run from a worker via asyncio.to_thread.
+        
+        The date window ends on the account's current day (segments.date is
+        reported in the account time zone, not the server's).
+        """
+        today = self._account_now(customer_id).date()
+        watermark = self.watermarks.get(customer_id, self.SEARCH_TERMS)
+        
+        if watermark:
+            start = date.fromisoformat(watermark) - timedelta(days=self.restatement_days)
+        else:
+            start = today - timedelta(days=self.initial_lookback_days)
+        
+        query = GAQLService.build_search_term_query(start_date=start.isoformat(), end_date=today.isoformat())
+        ingestion = SearchTermIngestionService(self.db, self.client)
+        stats = ingestion.ingest_rows(customer_id, ingestion.stream_rows(customer_id, query))
+        
+        self.watermarks.set(customer_id, self.SEARCH_TERMS, today.isoformat())
+        return SyncResult(
+            customer_id=customer_id,
+            resource=self.SEARCH_TERMS,
+            full_sync=watermark is None,
+            rows=stats.rows,
+            watermark=today.isoformat()
+        )
+
+    async def sync_campaigns(self, customer_id: str) -> SyncResult:
+        """
+        Pushes only changed campaigns into CampaignService.sync_campaigns_batch.
+        Falls back to a full sync without a watermark, if it is older than
+        the 90 days change_status can look back, or if the change list
+        cannot be paged completely.
+        
+        Timestamps are in the account's time zone (as change_status reports
+        them); the window starts SYNC_CHANGE_OVERLAP_SECONDS before the
+        watermark so changes committed late are not skipped.
+        """
+        from app.domain.campaigns.services import CampaignService
+        
+        now = await asyncio.to_thread(self._account_now, customer_id)
+        until = now.strftime(CHANGE_TIME_FORMAT)
+        watermark = await asyncio.to_thread(self.watermarks.get, customer_id, self.CAMPAIGNS)
+        
+        full_sync = watermark is None or datetime.fromisoformat(watermark) < now - timedelta(days=89)
+        campaign_ids = None
+        if not full_sync:
+            since = (datetime.fromisoformat(watermark) - timedelta(seconds=self.change_overlap_seconds)).strftime(CHANGE_TIME_FORMAT)
+            campaign_ids = await asyncio.to_thread(self._changed_campaign_ids, customer_id, since, until)
+            if campaign_ids is None:
+                # Change list could not be paged completely
+                full_sync = True
+            elif not campaign_ids:
+                await asyncio.to_thread(self.watermarks.set, customer_id, self.CAMPAIGNS, until)
+                return SyncResult(customer_id=customer_id, resource=self.CAMPAIGNS, full_sync=False, rows=0, watermark=until)
+        
+        query = GAQLService.build_campaign_sync_query(None if full_sync else campaign_ids)
+        docs = await asyncio.to_thread(self._fetch_campaign_docs, customer_id, query)
+        if docs:
+            await CampaignService(self.db).sync_campaigns_batch(docs)
+        
+        # Every change up to `until` has been read (all pages, or a full sync)
+        await asyncio.to_thread(self.watermarks.set, customer_id, self.CAMPAIGNS, until)
+        return SyncResult(customer_id=customer_id, resource=self.CAMPAIGNS, full_sync=full_sync, rows=len(docs), watermark=until)
+
+    def _account_now(self, customer_id: str) -> datetime:
+        """
+        Current time in the account's time zone (naive, like change_status timestamps).
+        """
+        ga_service = self.client.get_service("GoogleAdsService")
+        rows = ga_service.search(customer_id=customer_id, query="SELECT customer.time_zone FROM customer LIMIT 1")
+        time_zone = next((row.customer.time_zone for row in rows), None) or "UTC"
+        return datetime.now(ZoneInfo(time_zone)).replace(tzinfo=None, microsecond=0)
+
+    def _changed_campaign_ids(self, customer_id: str, since: str, until: str) -> List[str] | None:
+        """
+        Campaign IDs changed in [since, until], paged by last_change_date_time
+        whenever a page hits the query LIMIT.
+        
+        Returns:
+            The IDs, or None if a full page shares one timestamp (the next
+            page could not advance) - the caller then does a full sync
+        """
+        ga_service = self.client.get_service("GoogleAdsService")
+        
+        ids = set()
+        while True:
+            query = GAQLService.build_campaign_change_query(since, until, self.change_page_size)
+            rows = 0
+            last_change = None
+            for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+                for row in batch.results:
+                    rows += 1
+                    # customers/{customer_id}/campaigns/{campaign_id}
+                    ids.add(row.change_status.campaign.rsplit("/", 1)[-1])
+                    last_change = row.change_status.last_change_date_time
+            if rows < self.change_page_size:
+                return sorted(ids)
+            # Truncated: continue from the last timestamp read (inclusive, so
+            # rows sharing it are not lost; duplicates collapse in the set)
+            next_since = last_change[:19]
+            if next_since == since:
+                print(f"WARNING: change_status page for {customer_id} did not advance past {since}; full sync")
+                return None
+            since = next_since
+
+    def _fetch_campaign_docs(self, customer_id: str, query: str) -> List[dict]:
+        ga_service = self.client.get_service("GoogleAdsService")
+        
+        docs = []
+        for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+            for row in batch.results:
+                campaign = row.campaign
+                docs.append({
+                    "_key": str(campaign.id),
+                    "customer_id": customer_id,
+                    "name": campaign.name,
+                    "status": campaign.status.name,
+                    "advertising_channel_type": campaign.advertising_channel_type.name,
+                    "start_date": campaign.start_date or None,
+                    "end_date": campaign.end_date or None,
+                    "serving_status": campaign.serving_status.name
+                })
+        return docs
@@ -0,0 +1,150 @@
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any
+import msgspec
+
+
+class CacheStats(msgspec.Struct):
+    """
+    Counters for the Gemini response cache.
+    """
+    hits: int
+    misses: int
+    redis_hits: int
+    entries: int
+    max_entries: int
+
+
+def build_cache_key(
+    model: str,
+    prompt: str,
+    response_schema: dict[str, Any],
+    temperature: float,
+    system_instruction: str | None = None
+) -> str:
+    """
+    Content-addressed key for a structured generation request.
+
+    The prompt is whitespace-normalized (the service prompts are indented
+    f-strings) and the schema is encoded with sorted keys, so semantically
+    identical requests map to the same key.
+    """
+    payload = msgspec.json.encode(
+        {
+            "model": model,
+            "prompt": " ".join(prompt.split()),
+            "schema": response_schema,
+            "temperature": temperature,
+            "system_instruction": system_instruction,
+        },
+        order="sorted"
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for Gemini structured responses.
+
+    1. In-memory LRU (per process) with TTL and max entry count.
+    2. Optional Redis tier shared by API and worker processes.
+
+    Values are stored as encoded JSON bytes so callers always receive a
+    fresh dict they are free to mutate (e.g. the RSA auto-correct path).
+    """
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 86400,
+        redis_client: Any | None = None,
+        key_prefix: str = "gemini:response:"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return msgspec.json.decode(payload)
+            del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                payload = await self.redis.get(self.key_prefix + key)
+            except Exception as e:
+                print(f"WARNING: Redis cache lookup failed: {e}")
+                payload = None
+            if payload is not None:
+                self._store_local(key, payload)
+                self.hits += 1
+                self.redis_hits += 1
+                return msgspec.json.decode(payload)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        payload = msgspec.json.encode(value)
+        self._store_local(key, payload)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(self.key_prefix + key, payload, ex=int(self.ttl_seconds))
+            except Exception as e:
+                print(f"WARNING: Redis cache write failed: {e}")
+
+    def _store_local(self, key: str, payload: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+        self._entries.move_to_end(key)
+        # Size-based eviction (least recently used first)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            redis_hits=self.redis_hits,
+            entries=len(self._entries),
+            max_entries=self.max_entries
+        )
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Returns the process-wide response cache, creating it on first use.
+    The Redis tier is enabled with GEMINI_CACHE_REDIS=true.
+    """
+    global _response_cache
+    if _response_cache is None:
+        redis_client = None
+        if os.getenv("GEMINI_CACHE_REDIS", "false").lower() == "true":
+            from redis.asyncio import Redis
+            redis_client = Redis(
+                host=os.getenv("REDIS_HOST", "redis"),
+                port=int(os.getenv("REDIS_PORT", 6379))
+            )
+        _response_cache = ResponseCache(
+            max_entries=int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", 512)),
+            ttl_seconds=float(os.getenv("GEMINI_CACHE_TTL_SECONDS", 86400)),
+            redis_client=redis_client
+        )
+    return _response_cache
@@ -0,0 +1,238 @@
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from typing import Any
+import msgspec
+
+
+class CaptureRecord(msgspec.Struct, omit_defaults=True):
+    """
+    One captured Gemini response (written as a JSON line).
+    """
+    timestamp: float
+    correlation_id: str
+    stage: str
+    model: str
+    response: Any
+    errors: list[str] = []
+
+
+class CaptureStats(msgspec.Struct):
+    """
+    Counters for the response capture writer.
+    """
+    captured: int
+    written: int
+    dropped: int
+    pending: int
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ResponseCapture:
+    """
+    Sampled, non-blocking capture of raw Gemini responses for debugging.
+
+    capture() only samples, encodes a snapshot and enqueues it; a daemon
+    thread owns the file and writes JSON lines with size-based rotation.
+    When the queue is full records are dropped rather than blocking the
+    request.
+
+    Successful responses and responses that failed validation are sampled
+    with separate rates (GEMINI_CAPTURE_SAMPLE_RATE / GEMINI_CAPTURE_ERROR_SAMPLE_RATE).
+    """
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 0.0,
+        error_sample_rate: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        max_pending: int = 1000
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.error_sample_rate = error_sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._encoder = msgspec.json.Encoder()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+
+    def should_capture(self, failed: bool = False) -> bool:
+        rate = self.error_sample_rate if failed else self.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def capture(
+        self,
+        correlation_id: str,
+        stage: str,
+        model: str,
+        response: Any,
+        errors: list[str] | None = None
+    ) -> bool:
+        """
+        Enqueue a snapshot of the response if it is sampled.
+
+        Args:
+            correlation_id: ID shared by all records of one request
+            stage: e.g. "response" or "validation_failed"
+            model: Gemini model name
+            response: Decoded response (encoded immediately, so later
+                mutation by the caller does not affect the record)
+            errors: Validation errors, if any
+
+        Returns:
+            True if the record was queued
+        """
+        if not self.should_capture(failed=bool(errors)):
+            return False
+
+        record = CaptureRecord(
+            timestamp=time.time(),
+            correlation_id=correlation_id,
+            stage=stage,
+            model=model,
+            response=response,
+            errors=errors or []
+        )
+        try:
+            payload = self._encoder.encode(record)
+        except Exception as e:
+            print(f"WARNING: Could not encode capture record {correlation_id}: {e}")
+            return False
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.captured += 1
+        return True
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="gemini-capture", daemon=True)
+                self._thread.start()
+
+    def _write_loop(self) -> None:
+        # Every file operation is guarded: the thread must keep draining the
+        # queue, otherwise it fills up and close() would wait on a dead writer
+        stream = None
+        try:
+            while True:
+                payload = self._queue.get()
+                if payload is self._STOP:
+                    break
+                try:
+                    if stream is None:
+                        stream = self._open()
+                    if self.max_bytes and stream.tell() + len(payload) + 1 > self.max_bytes:
+                        stream.close()
+                        stream = None
+                        try:
+                            self._rotate()
+                        except OSError as e:
+                            # Keep appending to the current file; rotation is retried on the next record
+                            print(f"WARNING: Failed to rotate Gemini capture file: {e}")
+                        stream = self._open()
+                    stream.write(payload + b"\n")
+                    stream.flush()
+                    self.written += 1
+                except Exception as e:
+                    self.dropped += 1
+                    print(f"WARNING: Failed to write Gemini capture record: {e}")
+                    # Reopen on the next record
+                    if stream is not None:
+                        try:
+                            stream.close()
+                        except OSError:
+                            pass
+                        stream = None
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, "ab")
+
+    def _rotate(self) -> None:
+        # path -> path.1 -> path.2 ... (oldest beyond backup_count is removed)
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Flush pending records and stop the writer thread.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            # Writer is stuck or gone; leave the daemon thread behind
+            print(f"WARNING: Gemini capture writer did not drain; {self._queue.qsize()} records lost")
+            return
+        thread.join(timeout)
+
+    def stats(self) -> CaptureStats:
+        return CaptureStats(
+            captured=self.captured,
+            written=self.written,
+            dropped=self.dropped,
+            pending=self._queue.qsize()
+        )
+
+
+_response_capture: ResponseCapture | None = None
+
+
+def get_response_capture() -> ResponseCapture:
+    """
+    Returns the process-wide response capture, creating it on first use.
+    """
+    global _response_capture
+    if _response_capture is None:
+        _response_capture = ResponseCapture(
+            path=os.getenv("GEMINI_CAPTURE_PATH", "logs/gemini_responses.jsonl"),
+            sample_rate=float(os.getenv("GEMINI_CAPTURE_SAMPLE_RATE", 0.0)),
+            error_sample_rate=float(os.getenv("GEMINI_CAPTURE_ERROR_SAMPLE_RATE", 1.0)),
+            max_bytes=int(os.getenv("GEMINI_CAPTURE_MAX_BYTES", 10 * 1024 * 1024)),
+            backup_count=int(os.getenv("GEMINI_CAPTURE_BACKUPS", 5)),
+            max_pending=int(os.getenv("GEMINI_CAPTURE_MAX_PENDING", 1000))
+        )
+    return _response_capture
+
+
+def close_response_capture() -> None:
+    global _response_capture
+    if _response_capture is not None:
+        _response_capture.close()
+        _response_capture = None
@@ -1,12 +1,36 @@
 import os
-from typing import Type, Any
+import asyncio
+import logging
+from typing import Type, Any, AsyncIterator, Callable
 from google import genai
 from google.genai.types import GenerateContentConfig, SafetySetting, HarmCategory, HarmBlockThreshold
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import msgspec
 from app.domain.campaigns.models import RSAAsset
-from app.lib.ai.schema_bridge import prepare_schema_for_gemini
-from app.lib.ai.validators import validate_rsa_assets, calculate_display_width
+from app.lib.ai.schema_bridge import prepare_schema_for_gemini, thaw
+from app.lib.ai.validators import validate_rsa_assets, repair_rsa_assets
+from app.lib.ai.cache import build_cache_key, get_response_cache
+from app.lib.ai.capture import get_response_capture, new_correlation_id
+
+
+logger = logging.getLogger(__name__)
+
+# Per-process cap on in-flight Gemini requests (shared by all GeminiService instances)
+MAX_CONCURRENT_GENERATIONS = int(os.getenv("GEMINI_MAX_CONCURRENCY", 8))
+GENERATION_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", 60))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("GEMINI_HEALTH_TIMEOUT_SECONDS", 10))
+
+_generation_slots: asyncio.Semaphore | None = None
+
+
+def _get_generation_slots() -> asyncio.Semaphore:
+    """
+    Lazily create the global semaphore inside the running event loop.
+    """
+    global _generation_slots
+    if _generation_slots is None:
+        _generation_slots = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+    return _generation_slots
 
 
 class GeminiService:
@@ -15,12 +39,13 @@ class GeminiService:
     Handles structured content generation with retry logic.
     """
     
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, timeout: float | None = None):
         """
         Initialize Gemini client.
         
         Args:
             api_key: Gemini API key. If None, uses GEMINI_API_KEY env var.
+            timeout: Per-call timeout in seconds. If None, uses GEMINI_TIMEOUT_SECONDS.
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
@@ -29,6 +54,7 @@ class GeminiService:
         self.client = genai.Client(api_key=self.api_key)
         # Use explicit stable version
         self.model = os.getenv("GEMINI_MODEL", "gemini-1.5-flash-001")
+        self.timeout = timeout or GENERATION_TIMEOUT_SECONDS
         
         # Safety settings for ad content (allow marketing language)
         self.safety_settings = [
@@ -46,7 +72,8 @@ class GeminiService:
         self,
         prompt: str,
         response_schema: dict[str, Any],
-        system_instruction: str | None = None
+        system_instruction: str | None = None,
+        temperature: float = 0.7
     ) -> dict[str, Any]:
         """
         Generate structured content using Gemini with schema validation.
@@ -55,49 +82,167 @@ class GeminiService:
             prompt: User prompt
             response_schema: JSON Schema for structured output
             system_instruction: Optional system instruction
+            temperature: Sampling temperature
             
         Returns:
             Parsed JSON response matching schema
+            
+        Raises:
+            TimeoutError: If Gemini does not answer within self.timeout
+        """
+        config = self._build_config(response_schema, temperature)
+        
+        # Non-blocking call via the SDK's async surface, bounded per process
+        async with _get_generation_slots():
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=config
+                ),
+                timeout=self.timeout
+            )
+        
+        # Parse JSON response
+        return msgspec.json.decode(response.text)
+    
+    async def stream_structured(
+        self,
+        prompt: str,
+        response_schema: dict[str, Any],
+        temperature: float = 0.7,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw JSON text of a structured generation chunk by chunk.
+        
+        Shares the response cache with generate_with_retry: a hit is yielded
+        as a single chunk, and a completed stream is stored for later calls.
+        
+        Yields:
+            Text chunks as received from Gemini
+            
+        Raises:
+            TimeoutError: If the whole stream takes longer than self.timeout
         """
-        config = GenerateContentConfig(
+        cache = get_response_cache()
+        key = build_cache_key(self.model, prompt, response_schema, temperature)
+        
+        if not bypass_cache:
+            cached = await cache.get(key)
+            if cached is not None:
+                yield msgspec.json.encode(cached).decode("utf-8")
+                return
+        
+        config = self._build_config(response_schema, temperature)
+        # The Gemini stream runs in its own task: the generation slot and the
+        # timeout cover only the Gemini side, so a slow consumer neither holds
+        # a slot nor gets cancelled by a deadline firing in its own code
+        received: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        async def _produce() -> None:
+            try:
+                async with _get_generation_slots():
+                    async with asyncio.timeout(self.timeout):
+                        stream = await self.client.aio.models.generate_content_stream(
+                            model=self.model,
+                            contents=prompt,
+                            config=config
+                        )
+                        async for chunk in stream:
+                            if chunk.text:
+                                received.put_nowait(chunk.text)
+            except Exception as e:
+                received.put_nowait(e)
+            else:
+                received.put_nowait(done)
+        
+        producer = asyncio.create_task(_produce())
+        chunks = []
+        try:
+            while True:
+                item = await received.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                chunks.append(item)
+                yield item
+        finally:
+            # Consumer gone early (disconnect, error): stop the Gemini stream
+            if not producer.done():
+                producer.cancel()
+        
+        await cache.set(key, msgspec.json.decode("".join(chunks)))
+    
+    def _build_config(self, response_schema: dict[str, Any], temperature: float) -> GenerateContentConfig:
+        return GenerateContentConfig(
             response_mime_type="application/json",
-            response_schema=response_schema,
+            # The SDK rewrites the schema in place; never hand it the shared copy
+            response_schema=thaw(response_schema),
             safety_settings=self.safety_settings,
-            temperature=0.7
+            temperature=temperature
         )
+    
+    async def generate_with_retry(
+        self,
+        prompt: str,
+        response_schema: dict[str, Any],
+        system_instruction: str | None = None,
+        temperature: float = 0.7,
+        bypass_cache: bool = False,
+        validate: Callable[[dict[str, Any]], None] | None = None
+    ) -> dict[str, Any]:
+        """
+        Generate structured content with automatic retry on failure.
         
-        # Use synchronous client (google-genai doesn't have stable async yet)
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=config
-        )
+        Responses are cached by a hash of (model, prompt, schema, temperature),
+        so repeated identical requests skip the Gemini round-trip.
         
-        # Parse JSON response
-        return msgspec.json.decode(response.text)
+        Args:
+            bypass_cache: Skip the cache lookup (the fresh result is still stored)
+            validate: Checks (and may repair) a fresh response before it is
+                cached; if it raises, nothing is cached and the error propagates.
+                Retry such failures with bypass_cache=True.
+        """
+        cache = get_response_cache()
+        key = build_cache_key(self.model, prompt, response_schema, temperature, system_instruction)
+        
+        if not bypass_cache:
+            cached = await cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = await self._generate_with_retry(prompt, response_schema, system_instruction, temperature)
+        if validate is not None:
+            validate(response)
+        await cache.set(key, response)
+        return response
     
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((ValueError, msgspec.DecodeError))
+        retry=retry_if_exception_type((ValueError, msgspec.DecodeError, TimeoutError))
     )
-    async def generate_with_retry(
+    async def _generate_with_retry(
         self,
         prompt: str,
         response_schema: dict[str, Any],
-        system_instruction: str | None = None
+        system_instruction: str | None,
+        temperature: float
     ) -> dict[str, Any]:
-        """
-        Generate structured content with automatic retry on failure.
-        """
-        return await self.generate_structured(prompt, response_schema, system_instruction)
+        return await self.generate_structured(prompt, response_schema, system_instruction, temperature)
     
     async def generate_rsa_assets(
         self,
-        landing_page_url: str,
         target_keywords: list[str],
+        landing_page_url: str | None = None,
         brand_voice: str | None = None,
-        language: str = "de"
+        language: str = "de",
+        bypass_cache: bool = False,
+        context: str | None = None,
+        correlation_id: str | None = None
     ) -> dict[str, Any]:
         """
         Generate Responsive Search Ad assets using Gemini 1.5 Flash.
@@ -106,113 +251,100 @@ class GeminiService:
         that meet Google Ads constraints.
         
         Args:
-            landing_page_url: URL of the landing page
             target_keywords: List of target keywords
+            landing_page_url: URL of the landing page (omitted from the prompt
+                if None, e.g. for report imports)
             brand_voice: Optional brand voice (e.g., "professional", "playful")
             language: ISO 639-1 language code
+            bypass_cache: Force a fresh generation
+            context: Optional background (e.g. ad group focus and campaign summary)
+            correlation_id: ID tagged on log lines and captured responses (generated if omitted)
             
         Returns:
-            Dict with 'headlines' and 'descriptions' lists
+            Dict with 'headlines' and 'descriptions' lists, plus 'repairs'
+            (TextRepair records) when over-limit texts were truncated
+            
+        Raises:
+            ValueError: If the response cannot be repaired (it is not cached;
+                retry with bypass_cache=True)
         """
         from app.lib.ai.schema_bridge import prepare_schema_for_gemini
         from app.domain.campaigns.models import RSAAsset
-        from app.lib.ai.validators import validate_rsa_assets
         
         # Build Chain-of-Thought prompt
         prompt = self._build_rsa_prompt(
-            landing_page_url,
             target_keywords,
+            landing_page_url,
             brand_voice,
-            language
+            language,
+            context
         )
         
         # Generate schema for RSAAsset
         schema = prepare_schema_for_gemini(RSAAsset)
         
-        print(f"DEBUG: Requesting generation with model {self.model}...")
-        # Generate with retry
-        response = await self.generate_with_retry(prompt, schema)
-        print("DEBUG: Received response from Gemini API")
+        correlation_id = correlation_id or new_correlation_id()
         
-        # DEBUG: Write raw response to file UNCONDITIONALLY
-        try:
-            with open("debug_gemini_response.log", "w", encoding="utf-8") as f:
-                import json
-                f.write(json.dumps(response, indent=2, ensure_ascii=False))
-            print("DEBUG: Wrote response to debug_gemini_response.log")
-        except Exception as e:
-            print(f"Failed to write debug log: {e}")
-
-        # Validate response
-        errors = validate_rsa_assets(response)
-
-        if errors:
-            print(f"Validation WARNING: {errors}")
-            
-            # DEBUG: Write raw response to file
-            try:
-                with open("debug_gemini_response.log", "w", encoding="utf-8") as f:
-                    import json
-                    f.write(json.dumps(response, indent=2, ensure_ascii=False))
-            except Exception as e:
-                print(f"Failed to write debug log: {e}")
-
-            # Auto-correct length issues by truncation
-            # Auto-correct length issues by truncation
-            # We iterate through the raw dict before converting to struct if needed, 
-            # but here response is a dict from msgspec
+        def _validate(response: dict[str, Any]) -> None:
+            errors = validate_rsa_assets(response)
             
-            # Helper to strict truncate
-            def enforce_limit(text: str, limit: int) -> str:
-                if calculate_display_width(text) <= limit:
-                    return text
-                # Truncate char by char until it fits
-                while calculate_display_width(text) > limit:
-                    text = text[:-1]
-                return text.strip()
-
-            if "headlines" in response:
-                response["headlines"] = [
-                    enforce_limit(h, 30) for h in response["headlines"]
-                ]
-            
-            if "descriptions" in response:
-                response["descriptions"] = [
-                    enforce_limit(d, 90) for d in response["descriptions"]
-                ]
+            # Sampled raw-response capture (queued; written by a background thread)
+            get_response_capture().capture(
+                correlation_id,
+                "validation_failed" if errors else "response",
+                self.model,
+                response,
+                errors
+            )
             
-            # Re-validate after fixing
-            remaining_errors = validate_rsa_assets(response)
-            if remaining_errors:
-                print(f"CRITICAL Validation errors: {remaining_errors}")
-                # Only raise if still invalid (e.g. empty list)
-                # But even then, try to return what we have
-                if not response.get("headlines") or not response.get("descriptions"):
-                     raise ValueError(f"Generation failed: {remaining_errors}")
-
+            if errors:
+                logger.warning("RSA validation errors [%s], repairing: %s", correlation_id, errors)
+                
+                # Auto-correct length issues by truncation (single pass, word boundaries)
+                repairs = repair_rsa_assets(response)
+                response["repairs"] = msgspec.to_builtins(repairs)
+                
+                # Re-validate after fixing
+                remaining_errors = validate_rsa_assets(response)
+                if remaining_errors:
+                    logger.warning("RSA validation errors after repair [%s]: %s", correlation_id, remaining_errors)
+                    # Only raise if still invalid (e.g. empty list)
+                    # But even then, try to return what we have
+                    if not response.get("headlines") or not response.get("descriptions"):
+                        raise ValueError(f"Generation failed: {remaining_errors}")
+        
+        logger.debug("Requesting RSA generation with model %s [%s]", self.model, correlation_id)
+        # Generate with retry; only validated (possibly repaired) responses are
+        # cached, so a rejected response is not served again from the cache
+        response = await self.generate_with_retry(prompt, schema, bypass_cache=bypass_cache, validate=_validate)
+        logger.debug("Received RSA response [%s]", correlation_id)
+        
         return response
     
     def _build_rsa_prompt(
         self,
-        landing_page_url: str,
         target_keywords: list[str],
+        landing_page_url: str | None,
         brand_voice: str | None,
-        language: str
+        language: str,
+        context: str | None = None
     ) -> str:
         """
         Build Chain-of-Thought prompt for RSA generation.
         """
         keywords_str = ", ".join(target_keywords)
         voice_instruction = f"Brand voice: {brand_voice}. " if brand_voice else ""
+        context_section = f"\n**Context:**\n{context}\n" if context else ""
+        landing_page_line = f"**Landing Page:** {landing_page_url}\n" if landing_page_url else ""
+        source = "landing page URL" if landing_page_url else "context"
         
         return f"""You are an expert Google Ads copywriter specializing in Responsive Search Ads (RSA).
 
-**Task:** Generate high-performing RSA assets for the following landing page.
+**Task:** Generate high-performing RSA assets for the following {"landing page" if landing_page_url else "ad group"}.
 
-**Landing Page:** {landing_page_url}
-**Target Keywords:** {keywords_str}
+{landing_page_line}**Target Keywords:** {keywords_str}
 {voice_instruction}**Language:** {language}
-
+{context_section}
 **Requirements:**
 1. **Headlines:** Generate exactly 15 unique headlines
    - Each headline MUST be maximum 30 characters (count characters, not words!)
@@ -234,7 +366,7 @@ class GeminiService:
 - Ensure all text is in {language}.
 
 **Chain-of-Thought Process:**
-1. First, analyze the landing page URL and identify 3-5 unique selling points (USPs)
+1. First, analyze the {source} and identify 3-5 unique selling points (USPs)
 2. Then, create keyword-focused headlines that naturally incorporate the target keywords
 3. Next, create benefit-focused headlines highlighting the USPs
 4. Finally, create action-oriented headlines and descriptions
@@ -245,13 +377,19 @@ Generate the assets now, ensuring strict adherence to character limits."""
         """
         Check Gemini API connectivity.
         
+        The probe does not take a generation slot, so a saturated generation
+        queue is not reported as an unhealthy API.
+        
         Returns:
             Status dict with model and connection info
         """
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents="Respond with 'OK'"
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents="Respond with 'OK'"
+                ),
+                timeout=HEALTH_CHECK_TIMEOUT_SECONDS
             )
             return {
                 "status": "healthy",
@@ -2,28 +2,123 @@ import msgspec
 from typing import Type, Any
 
 
-def prepare_schema_for_gemini(struct: Type) -> dict[str, Any]:
+class FrozenSchema(dict):
+    """
+    Read-only JSON Schema dict shared across requests.
+    
+    Nested objects are FrozenSchema as well, arrays are tuples. Use thaw()
+    to get a mutable copy (the google-genai SDK rewrites schemas in place).
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Compiled Gemini schemas are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenSchema, (dict(self),))
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return FrozenSchema({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """
+    Deep mutable copy of a (frozen) schema.
+    """
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(item) for item in obj]
+    return obj
+
+
+class SchemaRegistry:
+    """
+    Per-type cache of compiled Gemini schemas.
+    
+    The schema is a pure function of the struct type, so generation,
+    sanitizing, $ref inlining and constraint validation run once per type
+    at registration instead of on every request.
+    """
+    def __init__(self):
+        self._schemas: dict[Type, FrozenSchema] = {}
+
+    def register(self, struct: Type) -> FrozenSchema:
+        """
+        Compile and store the schema for a struct.
+        
+        Raises:
+            ValueError: If the compiled schema violates Gemini constraints
+        """
+        schema = inline_refs(_sanitize_schema(msgspec.json.schema(struct)))
+        errors = validate_schema_constraints(schema)
+        if errors:
+            raise ValueError(f"Schema for {struct.__name__} is not Gemini compatible: {errors}")
+        
+        compiled = _freeze(schema)
+        self._schemas[struct] = compiled
+        return compiled
+
+    def get(self, struct: Type) -> FrozenSchema:
+        compiled = self._schemas.get(struct)
+        if compiled is None:
+            compiled = self.register(struct)
+        return compiled
+
+    def warm(self, structs: tuple[Type, ...]) -> None:
+        for struct in structs:
+            if struct not in self._schemas:
+                self.register(struct)
+
+    def __contains__(self, struct: Type) -> bool:
+        return struct in self._schemas
+
+
+schema_registry = SchemaRegistry()
+
+
+def warm_schema_registry() -> None:
+    """
+    Pre-compile the schemas of every struct requested from Gemini by the
+    AI endpoints. Called from the Litestar and arq startup hooks.
+    """
+    from app.domain.campaigns.models import RSAAsset, CampaignStructure, CampaignOutline
+    schema_registry.warm((RSAAsset, CampaignStructure, CampaignOutline))
+
+
+def prepare_schema_for_gemini(struct: Type) -> FrozenSchema:
     """
     Transform a Msgspec struct into a Gemini-compatible JSON Schema.
     
     Gemini 1.5 Flash supports a subset of JSON Schema (OpenAPI 3.0 compatible).
-    This function:
+    On first use per type this:
     1. Generates base schema via msgspec.json.schema()
     2. Removes unsupported/wasteful metadata (title, description)
     3. Ensures additionalProperties is false
-    4. Validates constraints (maxLength, enum)
+    4. Inlines $ref definitions
+    5. Validates constraints (maxLength, enum)
+    
+    Subsequent calls return the same compiled, read-only schema.
     
     Args:
         struct: Msgspec Struct type
         
     Returns:
-        Sanitized JSON Schema dict compatible with Gemini
+        Frozen, sanitized JSON Schema compatible with Gemini
     """
-    # Generate base schema
-    schema = msgspec.json.schema(struct)
-    
-    # Sanitize schema recursively
-    return _sanitize_schema(schema)
+    return schema_registry.get(struct)
 
 
 def _sanitize_schema(schema: dict[str, Any]) -> dict[str, Any]:
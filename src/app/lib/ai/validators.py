@@ -1,5 +1,68 @@
+import re
 import unicodedata
-from typing import Annotated
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Annotated, Iterable
+import msgspec
+
+
+# Google Ads RSA display-width limits
+HEADLINE_MAX_WIDTH = 30
+DESCRIPTION_MAX_WIDTH = 90
+
+
+@lru_cache(maxsize=1)
+def _wide_ranges() -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Inclusive (starts, ends) of all East Asian Wide/Fullwidth code point ranges.
+    
+    Built once per process from unicodedata (so it tracks the interpreter's
+    Unicode version) and cached; everything below Latin-1 Supplement's end
+    is narrow, so the scan starts at U+0100.
+    """
+    starts, ends = [], []
+    start = None
+    for cp in range(0x100, 0x110000):
+        wide = unicodedata.east_asian_width(chr(cp)) in ('F', 'W')
+        if wide and start is None:
+            start = cp
+        elif not wide and start is not None:
+            starts.append(start)
+            ends.append(cp - 1)
+            start = None
+    if start is not None:
+        starts.append(start)
+        ends.append(0x10FFFF)
+    return tuple(starts), tuple(ends)
+
+
+@lru_cache(maxsize=1)
+def _wide_pattern() -> re.Pattern:
+    # One character class over all wide ranges: counting matches runs in C
+    starts, ends = _wide_ranges()
+    ranges = "".join(
+        f"{re.escape(chr(start))}-{re.escape(chr(end))}" for start, end in zip(starts, ends)
+    )
+    return re.compile(f"[{ranges}]")
+
+
+def char_display_width(char: str) -> int:
+    """
+    Display width of a single character (1 or 2).
+    """
+    cp = ord(char)
+    if cp < 0x100:
+        return 1
+    starts, ends = _wide_ranges()
+    i = bisect_right(starts, cp) - 1
+    return 2 if i >= 0 and cp <= ends[i] else 1
+
+
+def warm_display_width_table() -> None:
+    """
+    Builds the wide-range table ahead of the first non-Latin-1 string.
+    """
+    _wide_pattern()
 
 
 def calculate_display_width(text: str) -> int:
@@ -10,26 +73,50 @@ def calculate_display_width(text: str) -> int:
     - ASCII characters: 1 unit
     - CJK characters (Chinese, Japanese, Korean): 2 units
     
+    ASCII and Latin-1 text (the common case) is measured with len() alone;
+    other text adds one unit per wide character found by a single regex scan.
+    
     Args:
         text: Input string
         
     Returns:
         Display width in character units
     """
-    width = 0
-    for char in text:
-        # Check if character is East Asian Wide or Fullwidth
-        if unicodedata.east_asian_width(char) in ('F', 'W'):
-            width += 2
-        else:
-            width += 1
-    return width
+    if text.isascii() or max(text) < '\u0100':
+        return len(text)
+    return len(text) + len(_wide_pattern().findall(text))
+
+
+def calculate_display_widths(texts: Iterable[str]) -> list[int]:
+    """
+    Display widths of a batch of strings, in input order.
+    
+    Args:
+        texts: Input strings
+        
+    Returns:
+        Display width per string
+    """
+    pattern = None
+    widths = []
+    for text in texts:
+        if text.isascii() or max(text) < '\u0100':
+            widths.append(len(text))
+            continue
+        if pattern is None:
+            pattern = _wide_pattern()
+        widths.append(len(text) + len(pattern.findall(text)))
+    return widths
 
 
-def validate_headline(headline: str) -> list[str]:
+def validate_headline(headline: str, width: int | None = None) -> list[str]:
     """
     Validate a single headline against Google Ads constraints.
     
+    Args:
+        headline: Headline text
+        width: Precomputed display width (computed if omitted)
+    
     Returns:
         List of validation errors (empty if valid)
     """
@@ -39,17 +126,22 @@ def validate_headline(headline: str) -> list[str]:
         errors.append("Headline cannot be empty")
         return errors
     
-    width = calculate_display_width(headline)
-    if width > 30:
-        errors.append(f"Headline exceeds 30 characters (actual: {width})")
+    if width is None:
+        width = calculate_display_width(headline)
+    if width > HEADLINE_MAX_WIDTH:
+        errors.append(f"Headline exceeds {HEADLINE_MAX_WIDTH} characters (actual: {width})")
     
     return errors
 
 
-def validate_description(description: str) -> list[str]:
+def validate_description(description: str, width: int | None = None) -> list[str]:
     """
     Validate a single description against Google Ads constraints.
     
+    Args:
+        description: Description text
+        width: Precomputed display width (computed if omitted)
+    
     Returns:
         List of validation errors (empty if valid)
     """
@@ -59,9 +151,10 @@ def validate_description(description: str) -> list[str]:
         errors.append("Description cannot be empty")
         return errors
     
-    width = calculate_display_width(description)
-    if width > 90:
-        errors.append(f"Description exceeds 90 characters (actual: {width})")
+    if width is None:
+        width = calculate_display_width(description)
+    if width > DESCRIPTION_MAX_WIDTH:
+        errors.append(f"Description exceeds {DESCRIPTION_MAX_WIDTH} characters (actual: {width})")
     
     return errors
 
@@ -92,14 +185,16 @@ def validate_rsa_assets(assets: dict) -> list[str]:
     if len(descriptions) > 4:
         errors.append(f"Maximum 4 descriptions allowed (got {len(descriptions)})")
     
-    # Individual validation
+    # Individual validation (all widths measured in one batch)
+    widths = calculate_display_widths(headlines + descriptions)
+    
     for i, headline in enumerate(headlines):
-        headline_errors = validate_headline(headline)
+        headline_errors = validate_headline(headline, widths[i])
         for error in headline_errors:
             errors.append(f"Headline {i+1}: {error}")
     
     for i, description in enumerate(descriptions):
-        desc_errors = validate_description(description)
+        desc_errors = validate_description(description, widths[len(headlines) + i])
         for error in desc_errors:
             errors.append(f"Description {i+1}: {error}")
     
@@ -115,25 +210,112 @@ def validate_rsa_assets(assets: dict) -> list[str]:
     return errors
 
 
-def truncate_to_limit(text: str, max_width: int) -> str:
+class TextRepair(msgspec.Struct):
+    """
+    Record of one auto-corrected asset text.
+    """
+    field: str
+    index: int
+    limit: int
+    original: str
+    repaired: str
+    original_width: int
+    width: int
+    word_boundary: bool
+
+
+# Trailing characters dropped after a cut so text does not end mid-phrase
+_TRAILING_JUNK = " \t\n,;:-–—/&|"
+
+
+def _truncate(text: str, max_width: int, word_boundary: bool = True) -> tuple[str, int, bool]:
+    """
+    One-pass truncation returning (text, display width, cut at word boundary).
+    """
+    if text.isascii() or max(text) < '\u0100':
+        # Narrow text: width == length
+        cut = max(max_width, 0)
+        if len(text) <= cut:
+            return text, len(text), False
+    else:
+        cut = 0
+        width = 0
+        for char in text:
+            char_width = char_display_width(char)
+            if width + char_width > max_width:
+                break
+            width += char_width
+            cut += 1
+        else:
+            return text, width, False
+    
+    kept = text[:cut]
+    at_boundary = False
+    if word_boundary and not text[cut].isspace():
+        # Back off to the last whitespace, unless that would drop more than half the text
+        space = max(kept.rfind(" "), kept.rfind("\t"), kept.rfind("\n"))
+        if space >= cut // 2:
+            kept = kept[:space]
+            at_boundary = True
+    elif word_boundary:
+        at_boundary = True
+    
+    kept = kept.rstrip(_TRAILING_JUNK)
+    return kept, calculate_display_width(kept), at_boundary
+
+
+def truncate_to_limit(text: str, max_width: int, word_boundary: bool = True) -> str:
     """
     Truncate text to fit within display width limit.
     
+    Runs in a single pass over the text. With word_boundary the cut is
+    moved back to the last whitespace when that keeps at least half of
+    the allowed text; trailing separators are removed.
+    
     Args:
         text: Input text
         max_width: Maximum display width
+        word_boundary: Prefer cutting between words
         
     Returns:
         Truncated text
     """
-    current_width = 0
-    result = []
+    return _truncate(text, max_width, word_boundary)[0]
+
+
+def repair_rsa_assets(assets: dict, word_boundary: bool = True) -> list[TextRepair]:
+    """
+    Truncate over-limit headlines and descriptions in place.
     
-    for char in text:
-        char_width = 2 if unicodedata.east_asian_width(char) in ('F', 'W') else 1
-        if current_width + char_width > max_width:
-            break
-        result.append(char)
-        current_width += char_width
+    Widths are measured in one batch and only strings over their limit are
+    rescanned, so repairing a response costs O(total characters).
     
-    return ''.join(result)
+    Args:
+        assets: Dict with 'headlines' and 'descriptions' keys
+        word_boundary: Prefer cutting between words
+        
+    Returns:
+        One TextRepair per modified string
+    """
+    repairs = []
+    for field, limit in (("headlines", HEADLINE_MAX_WIDTH), ("descriptions", DESCRIPTION_MAX_WIDTH)):
+        texts = assets.get(field)
+        if not texts:
+            continue
+        widths = calculate_display_widths(texts)
+        for i, (text, width) in enumerate(zip(texts, widths)):
+            if width <= limit:
+                continue
+            repaired, repaired_width, at_boundary = _truncate(text, limit, word_boundary)
+            texts[i] = repaired
+            repairs.append(TextRepair(
+                field=field,
+                index=i,
+                limit=limit,
+                original=text,
+                repaired=repaired,
+                original_width=width,
+                width=repaired_width,
+                word_boundary=at_boundary
+            ))
+    return repairs
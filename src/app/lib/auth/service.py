@@ -4,12 +4,14 @@ import msgspec
 from litestar.exceptions import NotAuthorizedException
 
 from app.lib.db.client import ArangoClient
+from app.lib.db.async_client import AsyncArangoClient, get_async_client
 from app.lib.auth.security import TokenEncryptor
 from app.domain.auth.models import UserCredentials, CredentialStatus
 
 class AuthService:
-    def __init__(self, db: ArangoClient):
+    def __init__(self, db: ArangoClient, async_db: AsyncArangoClient | None = None):
         self.db = db.get_db()
+        self.async_db = async_db or get_async_client()
         self.encryptor = TokenEncryptor()
         self.client_id = os.getenv("GOOGLE_CLIENT_ID")
         self.client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
@@ -72,12 +74,10 @@ class AuthService:
                 status=CredentialStatus.ACTIVE
             )
             
-            # Upsert into UserCredentials collection
-            col = self.db.collection("UserCredentials")
-            if not col.has(user_id):
-                col.insert(msgspec.to_builtins(creds), overwrite=True)
-            else:
-                col.update({"_key": user_id}, msgspec.to_builtins(creds))
+            # Upsert into UserCredentials collection (one round-trip, keyed by user_id)
+            await self.async_db.insert_document(
+                "UserCredentials", msgspec.to_builtins(creds), overwrite_mode="update"
+            )
                 
             return {"status": "success", "message": "Credentials stored securely."}
         except Exception as e:
@@ -0,0 +1,304 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Sequence, Type, TypeVar
+import httpx
+import msgspec
+from app.lib.db.raw import ArangoErrorBody, RawQueryError, batch_decoder, _encoder, _error_decoder
+
+T = TypeVar("T")
+
+
+class ImportResult(msgspec.Struct):
+    """
+    Counters of POST /_api/import.
+    """
+    created: int = 0
+    errors: int = 0
+    empty: int = 0
+    updated: int = 0
+    ignored: int = 0
+    details: List[str] = []
+
+
+class _TransactionStatus(msgspec.Struct):
+    id: str
+    status: str
+
+
+class _TransactionBody(msgspec.Struct):
+    result: _TransactionStatus
+
+
+_import_decoder = msgspec.json.Decoder(ImportResult)
+_transaction_decoder = msgspec.json.Decoder(_TransactionBody)
+
+# Server-side error numbers
+ERROR_ARANGO_CONFLICT = 1200  # write-write conflict
+ERROR_ARANGO_DOCUMENT_NOT_FOUND = 1202
+
+
+class AsyncArangoClient:
+    """
+    Non-blocking ArangoDB access over the HTTP API (httpx connection pool).
+
+    Covers what the async services need: AQL cursors as async generators,
+    document reads/writes, bulk import and stream transactions. Bodies are
+    encoded and decoded with msgspec; decoded rows can be typed structs.
+
+    Cancellation: a cancelled coroutine abandons its HTTP request; open
+    cursors are deleted and open transactions aborted on the way out, and
+    queries can carry a server-side max_runtime so abandoned work stops.
+    """
+    def __init__(
+        self,
+        host: str | None = None,
+        db_name: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        pool_size: int | None = None,
+        timeout: float | None = None
+    ):
+        host = host or os.getenv("ARANGO_HOST", "http://db:8529")
+        db_name = db_name or os.getenv("ARANGO_DB", "imap_hub")
+        pool_size = pool_size or int(os.getenv("ARANGO_POOL_SIZE", 10))
+        self._http = httpx.AsyncClient(
+            base_url=f"{host}/_db/{db_name}",
+            auth=(
+                username if username is not None else os.getenv("ARANGO_USER", "root"),
+                password if password is not None else os.getenv("ARANGO_PASSWORD", "")
+            ),
+            headers={"content-type": "application/json"},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout or float(os.getenv("ARANGO_POOL_TIMEOUT", 30))
+        )
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        body: Any = None,
+        params: Dict[str, Any] | None = None,
+        transaction_id: str | None = None
+    ) -> bytes:
+        """
+        Sends one request and returns the undecoded response body.
+
+        Raises:
+            RawQueryError: On any HTTP error status
+        """
+        headers = {"x-arango-trx-id": transaction_id} if transaction_id else None
+        content = None if body is None else (body if isinstance(body, bytes) else _encoder.encode(body))
+        response = await self._http.request(method, endpoint, content=content, params=params, headers=headers)
+        if response.status_code >= 400:
+            try:
+                error = _error_decoder.decode(response.content)
+            except msgspec.DecodeError:
+                error = ArangoErrorBody(errorMessage=response.text[:200], code=response.status_code)
+            raise RawQueryError(response.status_code, error)
+        return response.content
+
+    # --- AQL ----------------------------------------------------------------
+
+    async def cursor(
+        self,
+        query: str,
+        type: Type[T] = Any,
+        bind_vars: Dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        max_runtime: float | None = None,
+        transaction_id: str | None = None
+    ) -> AsyncIterator[T]:
+        """
+        Async generator over the query result; batches are fetched on demand.
+        The server cursor is deleted if iteration stops early (break, error,
+        cancellation).
+        """
+        decoder = batch_decoder(type)
+        body = {"query": query, "bindVars": bind_vars or {}, "batchSize": batch_size}
+        if max_runtime:
+            body["options"] = {"maxRuntime": max_runtime}
+        batch = decoder.decode(await self.request("POST", "/_api/cursor", body, transaction_id=transaction_id))
+        try:
+            while True:
+                for row in batch.result:
+                    yield row
+                if not batch.hasMore:
+                    return
+                batch = decoder.decode(
+                    await self.request("POST", f"/_api/cursor/{batch.id}", transaction_id=transaction_id)
+                )
+        finally:
+            if batch.hasMore and batch.id:
+                await self._delete_cursor(batch.id)
+
+    async def _delete_cursor(self, cursor_id: str) -> None:
+        # Shielded so a cancelled consumer still frees the server cursor
+        try:
+            await asyncio.shield(self.request("DELETE", f"/_api/cursor/{cursor_id}"))
+        except (RawQueryError, httpx.HTTPError, asyncio.CancelledError):
+            pass
+
+    async def query(
+        self,
+        query: str,
+        type: Type[T] = Any,
+        bind_vars: Dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        max_runtime: float | None = None,
+        transaction_id: str | None = None
+    ) -> List[T]:
+        """
+        Runs the query and returns all rows as `type`.
+        """
+        return [
+            row async for row in self.cursor(query, type, bind_vars, batch_size, max_runtime, transaction_id)
+        ]
+
+    # --- Documents ----------------------------------------------------------
+
+    async def get_document(self, collection: str, key: str, type: Type[T] = Any) -> T | None:
+        try:
+            content = await self.request("GET", f"/_api/document/{collection}/{key}")
+        except RawQueryError as e:
+            if e.error_num == ERROR_ARANGO_DOCUMENT_NOT_FOUND or e.status == 404:
+                return None
+            raise
+        return msgspec.json.decode(content, type=type)
+
+    async def insert_document(
+        self,
+        collection: str,
+        document: Any,
+        overwrite_mode: str | None = None,
+        transaction_id: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Inserts one document; overwrite_mode ("update", "replace", "ignore")
+        turns the insert into an upsert by _key.
+        """
+        params = {"overwriteMode": overwrite_mode} if overwrite_mode else None
+        content = await self.request(
+            "POST", f"/_api/document/{collection}", document, params=params, transaction_id=transaction_id
+        )
+        return msgspec.json.decode(content)
+
+    async def import_bulk(
+        self,
+        collection: str,
+        documents: Sequence[Any],
+        on_duplicate: str = "error"
+    ) -> ImportResult:
+        """
+        POST /_api/import with a JSON array body (not transactional).
+        """
+        content = await self.request(
+            "POST",
+            "/_api/import",
+            list(documents),
+            params={"collection": collection, "type": "list", "onDuplicate": on_duplicate, "details": "true"}
+        )
+        return _import_decoder.decode(content)
+
+    # --- Stream transactions ------------------------------------------------
+
+    async def begin_transaction(
+        self,
+        write: Sequence[str] = (),
+        read: Sequence[str] = (),
+        exclusive: Sequence[str] = (),
+        lock_timeout: int | None = None,
+        max_transaction_size: int | None = None
+    ) -> "AsyncTransaction":
+        body: Dict[str, Any] = {
+            "collections": {"write": list(write), "read": list(read), "exclusive": list(exclusive)}
+        }
+        if lock_timeout is not None:
+            body["lockTimeout"] = lock_timeout
+        if max_transaction_size is not None:
+            body["maxTransactionSize"] = max_transaction_size
+        status = _transaction_decoder.decode(await self.request("POST", "/_api/transaction/begin", body))
+        return AsyncTransaction(self, status.result.id)
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs) -> AsyncIterator["AsyncTransaction"]:
+        """
+        Begins a stream transaction; commits on success and aborts on any
+        exception, including cancellation.
+        """
+        trx = await self.begin_transaction(**kwargs)
+        try:
+            yield trx
+            await trx.commit()
+        except BaseException:
+            await trx.abort()
+            raise
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+
+class AsyncTransaction:
+    """
+    Handle of a running stream transaction; requests made through it carry
+    the x-arango-trx-id header.
+    """
+    def __init__(self, client: AsyncArangoClient, transaction_id: str):
+        self.client = client
+        self.id = transaction_id
+        self.status = "running"
+
+    def cursor(self, query: str, type: Type[T] = Any, bind_vars: Dict[str, Any] | None = None, batch_size: int = 1000) -> AsyncIterator[T]:
+        return self.client.cursor(query, type, bind_vars, batch_size, transaction_id=self.id)
+
+    async def query(self, query: str, type: Type[T] = Any, bind_vars: Dict[str, Any] | None = None, batch_size: int = 1000) -> List[T]:
+        return await self.client.query(query, type, bind_vars, batch_size, transaction_id=self.id)
+
+    async def insert_document(self, collection: str, document: Any, overwrite_mode: str | None = None) -> Dict[str, Any]:
+        return await self.client.insert_document(collection, document, overwrite_mode, transaction_id=self.id)
+
+    async def commit(self) -> None:
+        await self.client.request("PUT", f"/_api/transaction/{self.id}")
+        self.status = "committed"
+
+    async def abort(self) -> None:
+        if self.status != "running":
+            return
+        self.status = "aborted"
+        # Shielded: an abort triggered by cancellation must still reach the server
+        try:
+            await asyncio.shield(self.client.request("DELETE", f"/_api/transaction/{self.id}"))
+        except (RawQueryError, httpx.HTTPError, asyncio.CancelledError) as e:
+            print(f"WARNING: Failed to abort transaction {self.id}: {e}")
+
+
+_async_client: AsyncArangoClient | None = None
+
+
+def get_async_client() -> AsyncArangoClient:
+    """
+    Returns the process-wide async client, creating it on first use.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncArangoClient()
+    return _async_client
+
+
+async def close_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+@asynccontextmanager
+async def async_arango_lifespan(app) -> AsyncIterator[None]:
+    """
+    Litestar lifespan hook for the async client's connection pool.
+    """
+    app.state.arango_async = get_async_client()
+    try:
+        yield
+    finally:
+        await close_async_client()
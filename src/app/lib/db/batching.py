@@ -0,0 +1,126 @@
+import asyncio
+import inspect
+import os
+from typing import Any, Awaitable, Callable, Iterable, List, Sequence
+import msgspec
+
+
+# Outcome codes returned per document by chunk executors (see RETURN clauses in AQL)
+INSERTED = "inserted"
+UPDATED = "updated"
+DIRTY_PROTECTED = "dirty_protected"
+
+
+class ChunkStats(msgspec.Struct):
+    """
+    Result of one chunk of a batched write.
+    """
+    index: int
+    size: int
+    label: str = ""
+    inserted: int = 0
+    updated: int = 0
+    dirty_protected: int = 0
+    failed: int = 0
+    attempts: int = 0
+    error: str | None = None
+
+
+class BatchReport(msgspec.Struct):
+    """
+    Aggregated result of a batched write.
+    """
+    total: int
+    inserted: int
+    updated: int
+    dirty_protected: int
+    failed: int
+    chunks: List[ChunkStats]
+
+    @classmethod
+    def from_chunks(cls, chunks: List[ChunkStats]) -> "BatchReport":
+        return cls(
+            total=sum(c.size for c in chunks),
+            inserted=sum(c.inserted for c in chunks),
+            updated=sum(c.updated for c in chunks),
+            dirty_protected=sum(c.dirty_protected for c in chunks),
+            failed=sum(c.failed for c in chunks),
+            chunks=chunks
+        )
+
+    def merge(self, other: "BatchReport") -> "BatchReport":
+        return BatchReport.from_chunks(self.chunks + other.chunks)
+
+    @property
+    def failed_chunks(self) -> List[ChunkStats]:
+        return [c for c in self.chunks if c.failed]
+
+
+class BatchEngine:
+    """
+    Splits a write into chunks and runs them with bounded parallelism.
+
+    Each chunk is an independent request (and transaction) against ArangoDB,
+    so a failing chunk does not roll back the others. Failed chunks, and only
+    those, are retried up to max_retries times.
+
+    The executor receives one chunk and returns an outcome code per
+    document. Coroutine functions (AsyncArangoClient) are awaited directly;
+    blocking callables (python-arango) run in a thread so the event loop
+    stays free. Parallelism is additionally bounded by the connection pool
+    (ARANGO_POOL_SIZE).
+    """
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+        max_retries: int | None = None
+    ):
+        self.chunk_size = chunk_size or int(os.getenv("DB_BATCH_CHUNK_SIZE", 500))
+        self.concurrency = concurrency or int(os.getenv("DB_BATCH_CONCURRENCY", 4))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("DB_BATCH_MAX_RETRIES", 2))
+
+    def split(self, items: Sequence[Any]) -> List[Sequence[Any]]:
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    async def run(
+        self,
+        items: Sequence[Any],
+        execute: Callable[[Sequence[Any]], Iterable[str] | Awaitable[Iterable[str]]],
+        label: str = ""
+    ) -> BatchReport:
+        chunks = self.split(items)
+        stats = [ChunkStats(index=i, size=len(chunk), label=label) for i, chunk in enumerate(chunks)]
+        slots = asyncio.Semaphore(self.concurrency)
+        is_async = inspect.iscoroutinefunction(execute)
+
+        async def _run_chunk(i: int) -> None:
+            chunk_stats = stats[i]
+            async with slots:
+                chunk_stats.attempts += 1
+                try:
+                    if is_async:
+                        outcomes = list(await execute(chunks[i]))
+                    else:
+                        outcomes = await asyncio.to_thread(lambda: list(execute(chunks[i])))
+                except Exception as e:
+                    chunk_stats.failed = chunk_stats.size
+                    chunk_stats.error = f"{type(e).__name__}: {e}"
+                    return
+
+            chunk_stats.failed = 0
+            chunk_stats.error = None
+            chunk_stats.inserted = outcomes.count(INSERTED)
+            chunk_stats.updated = outcomes.count(UPDATED)
+            chunk_stats.dirty_protected = outcomes.count(DIRTY_PROTECTED)
+
+        pending = list(range(len(chunks)))
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                print(f"WARNING: Retrying {len(pending)} failed {label or 'batch'} chunk(s) (attempt {attempt + 1})")
+            await asyncio.gather(*(_run_chunk(i) for i in pending))
+            pending = [i for i in pending if stats[i].failed]
+
+        return BatchReport.from_chunks(stats)
@@ -1,36 +1,194 @@
 from arango import ArangoClient as PyArangoClient
 from arango.database import StandardDatabase
+from arango.http import DefaultHTTPClient
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+import threading
 import os
+import msgspec
+
+
+_json_encoder = msgspec.json.Encoder()
+
+
+def _serialize(obj: Any) -> str:
+    return _json_encoder.encode(obj).decode("utf-8")
+
+
+class PoolStats(msgspec.Struct):
+    """
+    Snapshot of the shared ArangoDB HTTP connection pool.
+    """
+    size: int
+    in_use: int
+    idle: int
+    waits: int
+
+
+class PooledHTTPClient(DefaultHTTPClient):
+    """
+    Keep-alive HTTP client with a bounded connection pool and usage counters.
+
+    All database handles created from the same ArangoClient share this
+    instance, so the pool size is a hard per-process limit on concurrent
+    requests against ArangoDB.
+    """
+    def __init__(self, pool_size: int = 10, pool_timeout: float | None = None):
+        super().__init__(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_timeout=pool_timeout
+        )
+        self.pool_size = pool_size
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._in_use = 0
+        self._waits = 0
+
+    def create_session(self, host: str):
+        session = super().create_session(host)
+        self._sessions.append(session)
+        return session
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        # Count callers that had to queue for a free connection
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._waits += 1
+            self._slots.acquire()
+
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def send_request(self, session, method, url, headers=None, params=None, data=None, auth=None):
+        with self._slot():
+            return super().send_request(session, method, url, headers, params, data, auth)
+
+    def stats(self) -> PoolStats:
+        idle = 0
+        for session in self._sessions:
+            for adapter in session.adapters.values():
+                pools = getattr(adapter, "poolmanager", None)
+                if pools is None:
+                    continue
+                for key in pools.pools.keys():
+                    pool = pools.pools.get(key)
+                    if pool is None or pool.pool is None:
+                        continue
+                    # urllib3 pre-fills the queue with None placeholders
+                    idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+        with self._lock:
+            return PoolStats(
+                size=self.pool_size,
+                in_use=self._in_use,
+                idle=idle,
+                waits=self._waits
+            )
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.close()
+        self._sessions.clear()
+
 
 class ArangoClient:
     """
     Wrapper for ArangoDB connection management.
+
+    Intended to be created once per process (Litestar lifespan / arq startup)
+    and shared; see get_shared_client().
     """
-    def __init__(self):
-        self._client = PyArangoClient(hosts=os.getenv("ARANGO_HOST", "http://db:8529"))
-        self._sys_db = self._client.db(
-            "_system",
-            username=os.getenv("ARANGO_USER", "root"),
-            password=os.getenv("ARANGO_PASSWORD", "")
+    def __init__(self, pool_size: int | None = None, ensure_database: bool = True):
+        self._http = PooledHTTPClient(
+            pool_size=pool_size or int(os.getenv("ARANGO_POOL_SIZE", 10)),
+            pool_timeout=float(os.getenv("ARANGO_POOL_TIMEOUT", 30))
+        )
+        self._host = os.getenv("ARANGO_HOST", "http://db:8529")
+        self._auth = (os.getenv("ARANGO_USER", "root"), os.getenv("ARANGO_PASSWORD", ""))
+        self._client = PyArangoClient(
+            hosts=self._host,
+            http_client=self._http,
+            # Request bodies (bind vars, bulk imports) and responses via msgspec
+            serializer=_serialize,
+            deserializer=msgspec.json.decode
         )
         self._db_name = os.getenv("ARANGO_DB", "imap_hub")
-        
-        # Ensure database exists
-        if not self._sys_db.has_database(self._db_name):
-            self._sys_db.create_database(self._db_name)
-            
+
+        # Ensure database exists (only once, at construction time)
+        if ensure_database:
+            sys_db = self._client.db(
+                "_system",
+                username=self._auth[0],
+                password=self._auth[1]
+            )
+            if not sys_db.has_database(self._db_name):
+                sys_db.create_database(self._db_name)
+
         self.db: StandardDatabase = self._client.db(
             self._db_name,
-            username=os.getenv("ARANGO_USER", "root"),
-            password=os.getenv("ARANGO_PASSWORD", "")
+            username=self._auth[0],
+            password=self._auth[1]
         )
 
     def get_db(self) -> StandardDatabase:
         return self.db
 
+    def pool_stats(self) -> PoolStats:
+        return self._http.stats()
+
+    def close(self) -> None:
+        self._http.close()
+        self._client.close()
+
+
+_shared_client: ArangoClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> ArangoClient:
+    """
+    Returns the process-wide ArangoClient, creating it on first use.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = ArangoClient()
+    return _shared_client
+
+
+def close_shared_client() -> None:
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
+@asynccontextmanager
+async def arango_lifespan(app) -> AsyncIterator[None]:
+    """
+    Litestar lifespan hook: opens the shared connection pool on startup
+    and releases it on shutdown.
+    """
+    app.state.arango = get_shared_client()
+    try:
+        yield
+    finally:
+        close_shared_client()
+
+
 async def get_arango_db() -> StandardDatabase:
     """
     Dependency injection provider.
     """
-    client = ArangoClient()
-    return client.get_db()
+    return get_shared_client().get_db()
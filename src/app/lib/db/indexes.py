@@ -0,0 +1,205 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Literal
+import msgspec
+from arango.database import StandardDatabase
+
+
+class IndexSpec(msgspec.Struct, frozen=True):
+    """
+    Declarative index definition.
+
+    Declared in the domain packages (app/domain/*/indexes.py) and applied
+    by IndexRegistry.apply(). The name identifies the index; changing any
+    other attribute replaces it on the next apply.
+    """
+    collection: str
+    name: str
+    fields: tuple[str, ...]
+    type: Literal["persistent", "ttl"] = "persistent"
+    unique: bool = False
+    sparse: bool = False
+    expire_after: int | None = None  # TTL indexes only (seconds)
+
+
+class QuerySpec(msgspec.Struct, frozen=True):
+    """
+    An AQL query of the repository layer, with sample bind vars for EXPLAIN.
+    """
+    name: str
+    aql: str
+    bind_vars: Dict[str, Any] = {}
+
+
+class IndexDiff(msgspec.Struct):
+    """
+    Result of applying the registry to a database.
+    """
+    created: List[str] = []
+    replaced: List[str] = []
+    unchanged: List[str] = []
+    skipped: List[str] = []  # Collection does not exist (yet)
+
+
+class QueryPlanReport(msgspec.Struct):
+    """
+    EXPLAIN summary of one registered query.
+    """
+    name: str
+    full_scans: List[str]      # Collections read via EnumerateCollectionNode
+    indexes_used: List[str]
+    estimated_cost: float | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans and self.error is None
+
+
+class IndexRegistry:
+    """
+    Collects index and query declarations from the domain packages.
+    """
+    # Domain modules holding INDEXES / QUERIES declarations
+    MODULES = (
+        "app.domain.campaigns.indexes",
+        "app.domain.assets.indexes",
+        "app.domain.reporting.indexes",
+    )
+
+    def __init__(self):
+        self._indexes: Dict[tuple[str, str], IndexSpec] = {}
+        self._queries: Dict[str, QuerySpec] = {}
+        self._loaded = False
+
+    def register(self, *specs: IndexSpec) -> None:
+        for spec in specs:
+            if spec.type == "ttl" and (spec.expire_after is None or len(spec.fields) != 1):
+                raise ValueError(f"TTL index {spec.name} needs exactly one field and expire_after")
+            self._indexes[(spec.collection, spec.name)] = spec
+
+    def register_query(self, *specs: QuerySpec) -> None:
+        for spec in specs:
+            self._queries[spec.name] = spec
+
+    def load(self) -> None:
+        """
+        Imports the domain declaration modules (once).
+        """
+        if self._loaded:
+            return
+        import importlib
+        for module_name in self.MODULES:
+            module = importlib.import_module(module_name)
+            self.register(*getattr(module, "INDEXES", ()))
+            self.register_query(*getattr(module, "QUERIES", ()))
+        self._loaded = True
+
+    @property
+    def indexes(self) -> List[IndexSpec]:
+        self.load()
+        return list(self._indexes.values())
+
+    @property
+    def queries(self) -> List[QuerySpec]:
+        self.load()
+        return list(self._queries.values())
+
+    def apply(self, db: StandardDatabase) -> IndexDiff:
+        """
+        Creates missing indexes and replaces changed ones. Idempotent;
+        indexes not declared in the registry are left alone.
+        """
+        diff = IndexDiff()
+        by_collection: Dict[str, List[IndexSpec]] = {}
+        for spec in self.indexes:
+            by_collection.setdefault(spec.collection, []).append(spec)
+
+        for collection_name, specs in by_collection.items():
+            if not db.has_collection(collection_name):
+                diff.skipped.extend(spec.name for spec in specs)
+                continue
+            collection = db.collection(collection_name)
+            # One index listing per collection
+            existing = {index.get("name"): index for index in collection.indexes()}
+
+            for spec in specs:
+                current = existing.get(spec.name)
+                if current is not None and self._matches(spec, current):
+                    diff.unchanged.append(spec.name)
+                    continue
+                if current is not None:
+                    collection.delete_index(current["id"])
+                self._create(collection, spec)
+                (diff.replaced if current is not None else diff.created).append(spec.name)
+        return diff
+
+    @staticmethod
+    def _matches(spec: IndexSpec, current: Dict[str, Any]) -> bool:
+        if current.get("type") != spec.type or tuple(current.get("fields", ())) != spec.fields:
+            return False
+        if spec.type == "ttl":
+            return current.get("expiry_time", current.get("expireAfter")) == spec.expire_after
+        return bool(current.get("unique")) == spec.unique and bool(current.get("sparse")) == spec.sparse
+
+    @staticmethod
+    def _create(collection, spec: IndexSpec) -> None:
+        if spec.type == "ttl":
+            collection.add_ttl_index(fields=list(spec.fields), expiry_time=spec.expire_after, name=spec.name)
+        else:
+            collection.add_persistent_index(
+                fields=list(spec.fields),
+                unique=spec.unique,
+                sparse=spec.sparse,
+                name=spec.name
+            )
+
+    def explain(self, db: StandardDatabase) -> List[QueryPlanReport]:
+        """
+        Runs EXPLAIN for every registered query and flags full collection scans.
+        """
+        reports = []
+        for query in self.queries:
+            try:
+                plan = db.aql.explain(query.aql, bind_vars=query.bind_vars)
+            except Exception as e:
+                reports.append(QueryPlanReport(name=query.name, full_scans=[], indexes_used=[], error=str(e)))
+                continue
+            if isinstance(plan, list):
+                plan = plan[0]
+
+            full_scans, indexes_used = [], []
+            for node in plan.get("nodes", []):
+                if node.get("type") == "EnumerateCollectionNode":
+                    full_scans.append(node.get("collection"))
+                elif node.get("type") == "IndexNode":
+                    for index in node.get("indexes", []):
+                        indexes_used.append(f"{node.get('collection')}.{index.get('name') or index.get('type')}")
+            reports.append(QueryPlanReport(
+                name=query.name,
+                full_scans=full_scans,
+                indexes_used=indexes_used,
+                estimated_cost=plan.get("estimated_cost", plan.get("estimatedCost"))
+            ))
+        return reports
+
+
+index_registry = IndexRegistry()
+
+
+async def apply_database_indexes() -> None:
+    """
+    Startup hook: applies the index registry to the shared database.
+    Disable with ARANGO_APPLY_INDEXES=false (e.g. read-only replicas).
+    """
+    if os.getenv("ARANGO_APPLY_INDEXES", "true").lower() != "true":
+        return
+    from app.lib.db.client import get_shared_client
+
+    try:
+        diff = await asyncio.to_thread(index_registry.apply, get_shared_client().get_db())
+    except Exception as e:
+        print(f"WARNING: Index sync failed: {e}")
+        return
+    if diff.created or diff.replaced:
+        print(f"Indexes created: {diff.created}, replaced: {diff.replaced}")
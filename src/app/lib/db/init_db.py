@@ -1,4 +1,70 @@
 from app.lib.db.client import ArangoClient
+from app.lib.db.repository import edge_key
+from app.lib.db.indexes import index_registry
+
+
+def print_query_plan_report(db) -> bool:
+    """
+    Prints the EXPLAIN summary of every registered query.
+    
+    Returns:
+        True if no query performs a full collection scan
+    """
+    ok = True
+    for report in index_registry.explain(db):
+        if report.error:
+            print(f"[explain] {report.name}: ERROR {report.error}")
+            ok = False
+        elif report.full_scans:
+            print(f"[explain] {report.name}: FULL SCAN of {', '.join(report.full_scans)}")
+            ok = False
+        else:
+            print(f"[explain] {report.name}: ok (indexes: {', '.join(report.indexes_used) or 'primary lookups'})")
+    return ok
+
+
+def migrate_edge_keys(db, collection: str = "uses_asset", batch_size: int = 1000) -> int:
+    """
+    Re-keys edges whose _key is not the deterministic edge_key(_from, _to, field_type).
+    
+    Idempotent: already-migrated edges are skipped. If two legacy edges map to
+    the same key (duplicate relations), the first one wins and the rest are removed.
+    
+    Returns:
+        Number of edges re-keyed
+    """
+    if not db.has_collection(collection):
+        return 0
+    edges = db.collection(collection)
+    cursor = db.aql.execute(
+        f"FOR e IN {collection} RETURN UNSET(e, '_id', '_rev')",
+        batch_size=batch_size,
+        stream=True
+    )
+    
+    migrated = 0
+    batch = []
+    
+    def _flush(batch):
+        # Insert under the new key first so the relation never disappears
+        edges.import_bulk([doc for _, doc in batch], on_duplicate="ignore")
+        edges.delete_many([{"_key": old_key} for old_key, _ in batch])
+    
+    for edge in cursor:
+        key = edge_key(edge["_from"], edge["_to"], edge.get("field_type"))
+        if edge["_key"] == key:
+            continue
+        batch.append((edge["_key"], {**edge, "_key": key}))
+        if len(batch) >= batch_size:
+            _flush(batch)
+            migrated += len(batch)
+            batch = []
+    if batch:
+        _flush(batch)
+        migrated += len(batch)
+    
+    return migrated
+
 
 def init_db():
     client = ArangoClient()
@@ -50,20 +116,30 @@ def init_db():
             )
             print(f"Created Edge Definition: {edge_name}")
 
-    # 4. Create Indexes
+    # 3b. Plain (non-graph) collections
+    for col in ["SyncWatermarks"]:
+        if not db.has_collection(col):
+            db.create_collection(col)
+            print(f"Created Collection: {col}")
+
+    # 4. Indexes (declared next to the domain models, see app.lib.db.indexes)
     # NOTE: Per Architecture Spec (Section 4.2):
     # "The hash becomes the _key for the Asset vertex"
     # We do NOT create a separate unique index on 'hash' because _key IS the hash.
     # The _key field is automatically unique by ArangoDB.
-    
-    # Stats Index (Persistent on entity_id, date)
-    if db.has_collection("DailyStats"):
-        stats = db.collection("DailyStats")
-        # Only create if not exists (check via index list)
-        existing = [i["name"] for i in stats.indexes()]
-        if "idx_stats_entity_date" not in existing:
-            stats.add_persistent_index(fields=["entity_id", "date"], name="idx_stats_entity_date")
-            print("Created Index: idx_stats_entity_date")
+    diff = index_registry.apply(db)
+    for name in diff.created:
+        print(f"Created Index: {name}")
+    for name in diff.replaced:
+        print(f"Replaced Index: {name}")
+
+    # 5. Migrations
+    rekeyed = migrate_edge_keys(db, "uses_asset")
+    if rekeyed:
+        print(f"Migrated {rekeyed} uses_asset edges to deterministic keys")
+
+    # 6. Query plan report (full collection scans in repository queries)
+    print_query_plan_report(db)
 
     print("Database Initialization Complete.")
 
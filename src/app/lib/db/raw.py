@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Generic, List, Type, TypeVar
+import msgspec
+
+T = TypeVar("T")
+
+
+class CursorBatch(msgspec.Struct, Generic[T]):
+    """
+    Body of POST /_api/cursor (and of follow-up batch requests).
+    Only the fields AsyncArangoClient needs are decoded.
+    """
+    result: List[T] = []
+    hasMore: bool = False
+    id: str | None = None
+
+
+class ArangoErrorBody(msgspec.Struct):
+    errorMessage: str = ""
+    errorNum: int = 0
+    code: int = 0
+
+
+class RawQueryError(RuntimeError):
+    """
+    AQL query or cursor request rejected by ArangoDB.
+    """
+    def __init__(self, status: int, body: ArangoErrorBody):
+        self.status = status
+        self.error_num = body.errorNum
+        super().__init__(f"[HTTP {status}][ERR {body.errorNum}] {body.errorMessage}")
+
+
+# Shared by AsyncArangoClient
+_encoder = msgspec.json.Encoder()
+_error_decoder = msgspec.json.Decoder(ArangoErrorBody)
+
+
+@lru_cache(maxsize=None)
+def batch_decoder(type: Type[T]) -> msgspec.json.Decoder:
+    """
+    Cached decoder for cursor batches of the given row type.
+    """
+    return msgspec.json.Decoder(CursorBatch[type])
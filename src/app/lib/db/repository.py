@@ -1,78 +1,303 @@
+import asyncio
+import functools
+import hashlib
+import os
+import random
+import msgspec
 from typing import List, Dict, Any
 from arango.database import StandardDatabase
+from app.lib.db.async_client import AsyncArangoClient, AsyncTransaction, ERROR_ARANGO_CONFLICT, get_async_client
+from app.lib.db.batching import BatchEngine, BatchReport, ChunkStats, INSERTED, UPDATED
+from app.lib.db.raw import RawQueryError
+
+
+# Per architecture: hash IS the _key, no separate hash field stored
+UPSERT_ASSETS_AQL = """
+FOR asset IN @assets
+    UPSERT { _key: asset.hash }
+    INSERT {
+        _key: asset.hash,
+        text: asset.text,
+        type: asset.type,
+        created_at: DATE_NOW()
+    }
+    UPDATE {
+        last_seen: DATE_NOW()
+    }
+    IN Assets
+    RETURN OLD == null ? "inserted" : "updated"
+"""
+
+EXISTING_ASSET_KEYS_AQL = "FOR doc IN DOCUMENT('Assets', @keys) RETURN doc._key"
+
+# Key-based write of vertices/edges inside a unit of work
+WRITE_DOCUMENTS_AQL = """
+FOR doc IN @docs
+    INSERT doc INTO @@collection OPTIONS { overwriteMode: @overwrite_mode }
+    RETURN OLD == null ? "inserted" : "updated"
+"""
+
+
+def edge_key(from_id: str, to_id: str, field_type: str | None = None) -> str:
+    """
+    Deterministic _key for an edge, derived from (from, to, field_type).
+    
+    Re-writing the same relation hits the primary index instead of needing
+    an UPSERT match on edge attributes.
+    """
+    return hashlib.sha1(f"{from_id}|{to_id}|{field_type or ''}".encode("utf-8")).hexdigest()
+
 
 class CampaignRepository:
-    def __init__(self, db: StandardDatabase):
+    def __init__(self, db: StandardDatabase, client: AsyncArangoClient | None = None):
         self.db = db
+        self._client = client
 
-    async def batch_upsert_assets(self, assets: List[Dict[str, Any]], links: List[Dict[str, Any]]) -> None:
+    @property
+    def client(self) -> AsyncArangoClient:
+        # Non-blocking access for the async methods (shared pool by default)
+        if self._client is None:
+            self._client = get_async_client()
+        return self._client
+
+    async def batch_upsert_assets(
+        self,
+        assets: List[Dict[str, Any]],
+        links: List[Dict[str, Any]],
+        engine: BatchEngine | None = None
+    ) -> BatchReport:
         """
-        Persists assets and edges using AQL atomic transactions.
+        Persists assets and edges in chunks.
         
         Per Architecture Spec (Section 4.2):
         - The hash becomes the _key for the Asset vertex
         - Uses UPSERT for deduplication
+        - Edges get a deterministic _key (see edge_key) and are bulk imported
+          with on_duplicate="update"
         
         Args:
             assets: List of dicts with keys: hash, text, type
             links: List of dicts with keys: from_id, to_id, field_type, pinned_field
+            engine: Batching engine (chunk size / parallelism); default from env
+            
+        Returns:
+            Per-chunk counts for the asset and link writes
+            
+        Raises:
+            RuntimeError: If chunks still fail after retries
         """
-        
-        # Skip if no assets to persist
-        if not assets:
-            # DEBUG: print("No assets to persist, skipping.")
-            return
-        
-        # DEBUG: print(f"Upserting {len(assets)} assets...")
+        engine = engine or BatchEngine()
+        report = BatchReport.from_chunks([])
         
         # 1. Upsert Assets (Vertices)
-        # Per architecture: hash IS the _key, no separate hash field stored
-        aql_assets = """
-        FOR asset IN @assets
-            UPSERT { _key: asset.hash }
-            INSERT {
-                _key: asset.hash,
-                text: asset.text,
-                type: asset.type,
-                created_at: DATE_NOW()
-            }
-            UPDATE {
-                last_seen: DATE_NOW()
-            }
-            IN Assets
-        """
-        
-        try:
-            # Execute Asset Upsert
-            self.db.aql.execute(aql_assets, bind_vars={"assets": assets})
-            # DEBUG: print("Asset upsert successful.")
-        except Exception as e:
-            print(f"ERROR: Asset upsert failed: {e}")
-            raise
+        # Skipped when every asset is already known (links may still be new)
+        if assets:
+            report = await engine.run(assets, self._upsert_assets, label="assets")
+            self._raise_on_failure(report, "Asset upsert")
 
         # Skip if no links to persist
         if not links:
             # DEBUG: print("No links to persist, skipping edge creation.")
-            return
+            return report
             
-        aql_links = """
-        FOR link IN @links
-            UPSERT { _from: link.from_id, _to: link.to_id, field_type: link.field_type }
-            INSERT {
-                _from: link.from_id,
-                _to: link.to_id,
-                field_type: link.field_type,
-                pinned_field: link.pinned_field
-            }
-            UPDATE {
-                pinned_field: link.pinned_field
+        edges = self.link_edges(links)
+        links_report = await engine.run(
+            edges,
+            functools.partial(self._import_edges, "uses_asset"),
+            label="links"
+        )
+        self._raise_on_failure(links_report, "Edge upsert")
+        
+        return report.merge(links_report)
+
+    def unit_of_work(self, **kwargs) -> "UnitOfWork":
+        """
+        Starts collecting writes that are committed together in one stream
+        transaction (see UnitOfWork).
+        """
+        return UnitOfWork(self.client, **kwargs)
+
+    @staticmethod
+    def link_edges(links: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        uses_asset edge documents (deterministic _key) for asset links.
+        """
+        return [
+            {
+                "_key": edge_key(link["from_id"], link["to_id"], link["field_type"]),
+                "_from": link["from_id"],
+                "_to": link["to_id"],
+                "field_type": link["field_type"],
+                "pinned_field": link.get("pinned_field")
             }
-            IN uses_asset
+            for link in links
+        ]
+
+    async def existing_asset_keys(self, keys: List[str]) -> set[str]:
+        """
+        Returns the subset of asset keys already stored, using one DOCUMENT() lookup.
+        """
+        if not keys:
+            return set()
+        return set(await self.client.query(EXISTING_ASSET_KEYS_AQL, str, {"keys": keys}))
+
+    async def ensure_ad_groups(self, ad_groups: List[Dict[str, Any]]) -> None:
+        """
+        Creates placeholder AdGroup vertices for uses_asset edges.
+        Existing documents are left untouched.
+        """
+        if ad_groups:
+            await self.client.import_bulk("AdGroups", ad_groups, on_duplicate="ignore")
+
+    async def _upsert_assets(self, chunk: List[Dict[str, Any]]) -> List[str]:
+        return await self.client.query(UPSERT_ASSETS_AQL, str, {"assets": chunk})
+
+    async def _import_edges(self, collection: str, edges: List[Dict[str, Any]]) -> List[str]:
+        """
+        Key-based bulk write of edges; existing keys are updated in place.
+        
+        Returns:
+            One outcome code per written edge
+            
+        Raises:
+            RuntimeError: If any document was rejected (fails the chunk)
+        """
+        result = await self.client.import_bulk(collection, edges, on_duplicate="update")
+        if result.errors:
+            raise RuntimeError(f"{result.errors} edge(s) rejected: {result.details[:3]}")
+        return [INSERTED] * result.created + [UPDATED] * result.updated
+
+    @staticmethod
+    def _raise_on_failure(report: BatchReport, operation: str) -> None:
+        if report.failed:
+            errors = "; ".join(c.error for c in report.failed_chunks if c.error)
+            print(f"ERROR: {operation} failed for {report.failed} documents: {errors}")
+            raise RuntimeError(f"{operation} failed for {len(report.failed_chunks)} chunk(s): {errors}")
+
+
+class UnitOfWork:
+    """
+    Multi-collection write committed atomically in one stream transaction.
+
+    Writes are queued with upsert_assets() / write() and only sent on
+    commit(): the transaction is opened on all touched collections, each
+    queued write goes out in chunks of chunk_size documents (one AQL request
+    per chunk, sequentially as stream transactions require), then a single
+    commit. Any failure, including cancellation, aborts the transaction so
+    no partial graph is left behind. Write-write conflicts (errorNum 1200)
+    retry the whole transaction with jittered backoff.
+    """
+    def __init__(
+        self,
+        client: AsyncArangoClient,
+        chunk_size: int | None = None,
+        max_retries: int | None = None,
+        lock_timeout: int | None = None
+    ):
+        self.client = client
+        self.chunk_size = chunk_size or int(os.getenv("DB_BATCH_CHUNK_SIZE", 500))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("DB_TRANSACTION_MAX_RETRIES", 3))
+        self.lock_timeout = lock_timeout
+        # (label, collection, AQL, documents bind var, other bind vars, documents)
+        self._writes: List[tuple[str, str, str, str, Dict[str, Any], List[Any]]] = []
+
+    def upsert_assets(self, assets: List[Dict[str, Any]]) -> "UnitOfWork":
+        """
+        Queues Asset vertices (same semantics as batch_upsert_assets).
+        """
+        if assets:
+            self._writes.append(("assets", "Assets", UPSERT_ASSETS_AQL, "assets", {}, list(assets)))
+        return self
+
+    def write(
+        self,
+        collection: str,
+        documents: List[Dict[str, Any]],
+        overwrite_mode: str = "update",
+        label: str = ""
+    ) -> "UnitOfWork":
+        """
+        Queues a key-based write of vertices or edges (documents carry _key).
+        
+        Args:
+            overwrite_mode: "update", "replace" or "ignore" for existing keys
         """
+        if documents:
+            bind_vars = {"@collection": collection, "overwrite_mode": overwrite_mode}
+            self._writes.append((label or collection, collection, WRITE_DOCUMENTS_AQL, "docs", bind_vars, list(documents)))
+        return self
+
+    @property
+    def collections(self) -> List[str]:
+        return sorted({write[1] for write in self._writes})
+
+    async def commit(self) -> BatchReport:
+        """
+        Sends all queued writes in one transaction.
+        
+        Returns:
+            Per-chunk counts (labels as queued)
+            
+        Raises:
+            RawQueryError: If the transaction fails, or still conflicts after retries
+        """
+        if not self._writes:
+            return BatchReport.from_chunks([])
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.client.transaction(write=self.collections, lock_timeout=self.lock_timeout) as trx:
+                    chunks = await self._send(trx)
+                return BatchReport.from_chunks(chunks)
+            except RawQueryError as e:
+                if e.error_num != ERROR_ARANGO_CONFLICT or attempt == self.max_retries:
+                    raise
+                delay = 0.05 * (2 ** attempt) * (1 + random.random())
+                print(f"WARNING: Write-write conflict on {self.collections}, retrying in {delay:.2f}s (attempt {attempt + 2})")
+                await asyncio.sleep(delay)
+
+    async def _send(self, trx: AsyncTransaction) -> List[ChunkStats]:
+        chunks = []
+        for label, _, query, docs_var, bind_vars, documents in self._writes:
+            for start in range(0, len(documents), self.chunk_size):
+                chunk = documents[start:start + self.chunk_size]
+                outcomes = await trx.query(query, str, {**bind_vars, docs_var: chunk})
+                chunks.append(ChunkStats(
+                    index=len(chunks),
+                    size=len(chunk),
+                    label=label,
+                    inserted=outcomes.count(INSERTED),
+                    updated=outcomes.count(UPDATED),
+                    attempts=1
+                ))
+        return chunks
+
+
+class SyncWatermarkRepository:
+    """
+    Stores incremental sync watermarks (one document per customer/resource).
+    """
+    COLLECTION = "SyncWatermarks"
+
+    def __init__(self, db: StandardDatabase):
+        self.db = db
+        self.collection = self.db.collection(self.COLLECTION)
+
+    @staticmethod
+    def _key(customer_id: str, resource: str) -> str:
+        return f"{customer_id}_{resource}"
+
+    def get(self, customer_id: str, resource: str) -> str | None:
+        doc = self.collection.get(self._key(customer_id, resource))
+        return doc["watermark"] if doc else None
+
+    def set(self, customer_id: str, resource: str, watermark: str) -> None:
+        from app.domain.reporting.models import SyncWatermark
         
-        try:
-            self.db.aql.execute(aql_links, bind_vars={"links": links})
-            # DEBUG: print("Edge upsert successful.")
-        except Exception as e:
-            print(f"ERROR: Edge upsert failed: {e}")
-            raise
+        doc = SyncWatermark(
+            _key=self._key(customer_id, resource),
+            customer_id=customer_id,
+            resource=resource,
+            watermark=watermark
+        )
+        self.collection.insert(msgspec.to_builtins(doc), overwrite=True)
@@ -1,13 +1,56 @@
 import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any
 import yaml
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
-from app.lib.db.client import ArangoClient
+from app.lib.db.client import ArangoClient, get_shared_client
 from app.lib.auth.security import TokenEncryptor
 from app.domain.auth.models import UserCredentials, CredentialStatus
 import msgspec
 
+class CachedGoogleAdsClient(GoogleAdsClient):
+    """
+    GoogleAdsClient that reuses its service clients.
+    
+    The stock get_service() opens a new gRPC channel on every call. Since the
+    channel carries the user's OAuth credentials, channels are shared per
+    user: every consumer of a cached client (mutator, sync, ingestion) gets
+    the same service client and channel, and the credential's access token
+    is refreshed once instead of per task.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._services: dict[tuple, Any] = {}
+        self._services_lock = threading.Lock()
+
+    def get_service(self, name: str, version: str | None = None, interceptors: list | None = None, is_async: bool = False) -> Any:
+        kwargs = {"interceptors": interceptors, "is_async": is_async}
+        if version:
+            kwargs["version"] = version
+        
+        # Custom interceptors and grpc.aio channels (bound to an event loop) are not shared
+        if interceptors or is_async:
+            return super().get_service(name, **kwargs)
+        
+        key = (name, version)
+        with self._services_lock:
+            service = self._services.get(key)
+            if service is None:
+                service = super().get_service(name, **kwargs)
+                self._services[key] = service
+            return service
+
+
+class _CacheEntry(msgspec.Struct):
+    client: Any
+    fingerprint: tuple
+    expires_at: float
+
+
 class GoogleAdsClientFactory:
     """
     Factory for creating authenticated GoogleAdsClient instances.
@@ -15,10 +58,18 @@ class GoogleAdsClientFactory:
     1. Retrieval of encrypted credentials.
     2. Decryption of Refresh Token using Envelope Encryption.
     3. Construction of the client config.
+    
+    Clients are cached per user (LRU, bounded, with TTL). A cached client is
+    reused as long as the stored credential's status, updated_at and
+    key_version are unchanged; any change (re-auth, revocation) rebuilds it.
     """
-    def __init__(self, db: ArangoClient):
+    def __init__(self, db: ArangoClient, max_clients: int | None = None, ttl_seconds: float | None = None):
         self.db = db.get_db()
         self.encryptor = TokenEncryptor()
+        self.max_clients = max_clients or int(os.getenv("GOOGLE_ADS_CLIENT_CACHE_SIZE", 64))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("GOOGLE_ADS_CLIENT_CACHE_TTL", 3000))
+        self._clients: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
         
         # Load static config (Developer Token, Client ID/Secret)
         # In prod these come from env, but the lib expects a dict or file
@@ -33,15 +84,25 @@ class GoogleAdsClientFactory:
         """
         Creates a client for a specific user context.
         """
-        # 1. Fetch Credentials
+        # 1. Fetch Credentials (single read)
         col = self.db.collection("UserCredentials")
-        if not col.has(user_id):
-            raise ValueError(f"No credentials found for user {user_id}")
-            
         doc = col.get(user_id)
+        if doc is None:
+            self.invalidate(user_id)
+            raise ValueError(f"No credentials found for user {user_id}")
+        
+        fingerprint = (doc.get("status"), doc.get("updated_at"), doc.get("key_version"))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._clients.get(user_id)
+            if entry is not None and entry.fingerprint == fingerprint and entry.expires_at > now:
+                self._clients.move_to_end(user_id)
+                return entry.client
+        
         creds = msgspec.convert(doc, type=UserCredentials)
         
         if creds.status != CredentialStatus.ACTIVE:
+            self.invalidate(user_id)
             raise ValueError(f"Credentials for {user_id} are not ACTIVE (Status: {creds.status})")
 
         # 2. Decrypt Refresh Token
@@ -62,8 +123,32 @@ class GoogleAdsClientFactory:
         
         # 4. Initialize Client
         # We assume v17 or latest stable
-        return GoogleAdsClient.load_from_dict(config, version="v17")
+        client = CachedGoogleAdsClient.load_from_dict(config, version="v17")
+        
+        with self._lock:
+            self._clients[user_id] = _CacheEntry(
+                client=client,
+                fingerprint=fingerprint,
+                expires_at=now + self.ttl_seconds
+            )
+            self._clients.move_to_end(user_id)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        
+        return client
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._clients.pop(user_id, None)
+
+
+_shared_factory: GoogleAdsClientFactory | None = None
 
 async def get_google_ads_factory() -> GoogleAdsClientFactory:
-    db = ArangoClient()
-    return GoogleAdsClientFactory(db)
+    """
+    Dependency provider; one factory (and client cache) per process.
+    """
+    global _shared_factory
+    if _shared_factory is None:
+        _shared_factory = GoogleAdsClientFactory(get_shared_client())
+    return _shared_factory
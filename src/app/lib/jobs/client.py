@@ -0,0 +1,137 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+import msgspec
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+from arq.jobs import Job, JobStatus
+from litestar.exceptions import NotFoundException
+
+
+# Queue names (one arq worker process consumes one queue)
+DEFAULT_QUEUE = "arq:queue"
+GENERATION_QUEUE = "arq:generation"
+
+
+class QueueConfig(msgspec.Struct, frozen=True):
+    """
+    Per-queue worker settings.
+    """
+    name: str
+    max_jobs: int
+    job_timeout: int  # seconds
+    keep_result: int  # seconds the result stays in Redis
+
+
+QUEUES = {
+    DEFAULT_QUEUE: QueueConfig(
+        name=DEFAULT_QUEUE,
+        max_jobs=int(os.getenv("WORKER_DEFAULT_MAX_JOBS", 10)),
+        job_timeout=int(os.getenv("WORKER_DEFAULT_JOB_TIMEOUT", 300)),
+        keep_result=int(os.getenv("WORKER_DEFAULT_KEEP_RESULT", 3600))
+    ),
+    # Gemini-bound jobs: few slots per replica, scale by adding replicas
+    GENERATION_QUEUE: QueueConfig(
+        name=GENERATION_QUEUE,
+        max_jobs=int(os.getenv("WORKER_GENERATION_MAX_JOBS", 4)),
+        job_timeout=int(os.getenv("WORKER_GENERATION_JOB_TIMEOUT", 600)),
+        keep_result=int(os.getenv("WORKER_GENERATION_KEEP_RESULT", 86400))
+    ),
+}
+
+
+def get_redis_settings() -> RedisSettings:
+    return RedisSettings(
+        host=os.getenv("REDIS_HOST", "redis"),
+        port=int(os.getenv("REDIS_PORT", 6379))
+    )
+
+
+class JobInfo(msgspec.Struct):
+    """
+    Status snapshot of a background job.
+    """
+    job_id: str
+    status: str  # deferred, queued, in_progress, complete, failed
+    result: Any | None = None
+    error: str | None = None
+
+
+_pool: ArqRedis | None = None
+
+
+async def get_job_pool() -> ArqRedis:
+    """
+    Returns the process-wide arq Redis pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        _pool = await create_pool(get_redis_settings())
+    return _pool
+
+
+async def close_job_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def job_queue_lifespan(app) -> AsyncIterator[None]:
+    """
+    Litestar lifespan hook for the arq Redis pool.
+    """
+    app.state.job_pool = await get_job_pool()
+    try:
+        yield
+    finally:
+        await close_job_pool()
+
+
+async def enqueue(
+    function: str,
+    queue_name: str = DEFAULT_QUEUE,
+    idempotency_key: str | None = None,
+    **kwargs: Any
+) -> JobInfo:
+    """
+    Enqueue a job, deduplicated by idempotency key.
+    
+    The key becomes the arq job ID, so re-submitting the same key while the
+    job is queued, running or its result is still kept returns the existing
+    job instead of starting a new one.
+    """
+    pool = await get_job_pool()
+    job_id = f"{function}:{idempotency_key}" if idempotency_key else None
+    
+    job = await pool.enqueue_job(function, _job_id=job_id, _queue_name=queue_name, **kwargs)
+    if job is None:
+        # Already exists (arq returns None for duplicate job IDs)
+        return await get_job_info(job_id, queue_name)
+    
+    return JobInfo(job_id=job.job_id, status=JobStatus.queued.value)
+
+
+async def get_job_info(job_id: str, queue_name: str = DEFAULT_QUEUE) -> JobInfo:
+    """
+    Looks up the status (and result, once complete) of a job.
+    
+    Raises:
+        NotFoundException: If the job is unknown (or its result has expired)
+    """
+    pool = await get_job_pool()
+    job = Job(job_id, pool, _queue_name=queue_name)
+    status = await job.status()
+    if status == JobStatus.not_found:
+        raise NotFoundException(f"Job {job_id} not found")
+    
+    if status != JobStatus.complete:
+        return JobInfo(job_id=job_id, status=status.value)
+    
+    result = await job.result_info()
+    if result is None:
+        return JobInfo(job_id=job_id, status=status.value)
+    if not result.success:
+        return JobInfo(job_id=job_id, status="failed", error=str(result.result))
+    return JobInfo(job_id=job_id, status=status.value, result=result.result)
@@ -4,11 +4,25 @@ from app.domain.assets.controllers import AssetController
 from app.domain.campaigns.controllers import CampaignController
 from app.domain.reporting.controllers import ReportingController
 from app.domain.auth.controllers import AuthController
+from app.lib.db.client import arango_lifespan, get_shared_client, PoolStats
+from app.lib.db.async_client import async_arango_lifespan
+from app.lib.db.indexes import apply_database_indexes
+from app.lib.ai.schema_bridge import warm_schema_registry
+from app.lib.ai.validators import warm_display_width_table
+from app.lib.ai.capture import close_response_capture
+from app.lib.jobs.client import job_queue_lifespan
 
 @get("/")
 async def hello_world() -> str:
     return "Hello World"
 
+@get("/health/db")
+async def db_pool_health() -> PoolStats:
+    """
+    Connection pool stats of the shared ArangoDB client.
+    """
+    return get_shared_client().pool_stats()
+
 # CORS Configuration for frontend
 cors_config = CORSConfig(
     allow_origins=["http://localhost:5173"],
@@ -20,10 +34,14 @@ cors_config = CORSConfig(
 app = Litestar(
     route_handlers=[
         hello_world,
+        db_pool_health,
         AssetController,
         CampaignController,
         ReportingController,
         AuthController
     ],
-    cors_config=cors_config
+    cors_config=cors_config,
+    lifespan=[arango_lifespan, async_arango_lifespan, job_queue_lifespan],
+    on_startup=[apply_database_indexes, warm_schema_registry, warm_display_width_table],
+    on_shutdown=[close_response_capture]
 )
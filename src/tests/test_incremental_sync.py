@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from app.domain.campaigns.services import CampaignService
+from app.domain.reporting.services import CHANGE_TIME_FORMAT, IncrementalSyncService
+
+# Run from src/: python -m pytest tests
+
+CUSTOMER_ID = "1234567890"
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def get(self, key):
+        return self.docs.get(key)
+
+    def insert(self, doc, overwrite=False):
+        self.docs[doc["_key"]] = doc
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+
+    def collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+class FakeGoogleAdsService:
+    """
+    Serves customer.time_zone, change_status and campaign queries from
+    in-memory campaigns, applying the status filter like the API does.
+    """
+    def __init__(self, campaigns, changed_ids, time_zone="Europe/Berlin"):
+        self.campaigns = campaigns
+        self.changed_ids = changed_ids
+        self.time_zone = time_zone
+        self.queries = []
+
+    def search(self, customer_id, query):
+        return [SimpleNamespace(customer=SimpleNamespace(time_zone=self.time_zone))]
+
+    def search_stream(self, customer_id, query):
+        self.queries.append(query)
+        if "FROM change_status" in query:
+            results = [
+                SimpleNamespace(change_status=SimpleNamespace(
+                    campaign=f"customers/{customer_id}/campaigns/{campaign_id}",
+                    last_change_date_time="2026-10-17 09:00:00.000000"
+                ))
+                for campaign_id in self.changed_ids
+            ]
+        elif "FROM campaign" in query:
+            results = [
+                SimpleNamespace(campaign=campaign)
+                for campaign in self.campaigns
+                if not ('campaign.status != "REMOVED"' in query and campaign.status.name == "REMOVED")
+                and not ("campaign.id IN" in query and str(campaign.id) not in query)
+            ]
+        else:
+            results = []
+        return [SimpleNamespace(results=results)]
+
+
+def _campaign(campaign_id, status):
+    return SimpleNamespace(
+        id=campaign_id,
+        name=f"Campaign {campaign_id}",
+        status=SimpleNamespace(name=status),
+        advertising_channel_type=SimpleNamespace(name="SEARCH"),
+        start_date="2026-01-01",
+        end_date="",
+        serving_status=SimpleNamespace(name="SERVING")
+    )
+
+
+def _service(ga_service):
+    client = SimpleNamespace(get_service=lambda name: ga_service)
+    return IncrementalSyncService(FakeDatabase(), client)
+
+
+def test_campaign_removed_inside_sync_window_is_synced_as_removed(monkeypatch):
+    ga_service = FakeGoogleAdsService(
+        campaigns=[_campaign(111, "ENABLED"), _campaign(222, "REMOVED")],
+        changed_ids=["222"]
+    )
+    service = _service(ga_service)
+    watermark = (datetime.now(ZoneInfo(ga_service.time_zone)) - timedelta(hours=1)).replace(tzinfo=None)
+    service.watermarks.set(CUSTOMER_ID, service.CAMPAIGNS, watermark.strftime(CHANGE_TIME_FORMAT))
+
+    synced = []
+
+    async def sync_campaigns_batch(self, campaigns, engine=None):
+        synced.extend(campaigns)
+
+    monkeypatch.setattr(CampaignService, "sync_campaigns_batch", sync_campaigns_batch)
+
+    result = asyncio.run(service.sync_campaigns(CUSTOMER_ID))
+
+    assert not result.full_sync
+    assert result.rows == 1
+    assert [(doc["_key"], doc["status"]) for doc in synced] == [("222", "REMOVED")]
+
+
+def test_full_campaign_sync_skips_removed(monkeypatch):
+    ga_service = FakeGoogleAdsService(
+        campaigns=[_campaign(111, "ENABLED"), _campaign(222, "REMOVED")],
+        changed_ids=[]
+    )
+    service = _service(ga_service)
+
+    synced = []
+
+    async def sync_campaigns_batch(self, campaigns, engine=None):
+        synced.extend(campaigns)
+
+    monkeypatch.setattr(CampaignService, "sync_campaigns_batch", sync_campaigns_batch)
+
+    result = asyncio.run(service.sync_campaigns(CUSTOMER_ID))
+
+    assert result.full_sync
+    assert [doc["_key"] for doc in synced] == ["111"]
+
+
+def test_search_term_window_ends_on_account_day():
+    # UTC+14: already tomorrow for most servers
+    ga_service = FakeGoogleAdsService(campaigns=[], changed_ids=[], time_zone="Pacific/Kiritimati")
+    service = _service(ga_service)
+
+    result = service.sync_search_terms(CUSTOMER_ID)
+
+    account_today = datetime.now(ZoneInfo("Pacific/Kiritimati")).date().isoformat()
+    assert result.watermark == account_today
+    assert f"AND '{account_today}'" in ga_service.queries[-1]
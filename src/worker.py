@@ -1,18 +1,30 @@
 import asyncio
 import os
-from arq.connections import RedisSettings
+import msgspec
+from arq.worker import func
 
-from app.lib.db.client import ArangoClient
+from app.lib.db.client import get_shared_client, close_shared_client
+from app.lib.db.async_client import get_async_client, close_async_client
 from app.lib.google_ads.client import GoogleAdsClientFactory
+from app.lib.ai.schema_bridge import warm_schema_registry
+from app.lib.ai.validators import warm_display_width_table
+from app.lib.ai.capture import close_response_capture
+from app.lib.jobs.client import QUEUES, DEFAULT_QUEUE, GENERATION_QUEUE, get_redis_settings
 
 async def startup(ctx):
     print("Worker starting up...")
-    ctx['arango_client'] = ArangoClient()
+    ctx['arango_client'] = get_shared_client()
+    ctx['arango_async'] = get_async_client()
     ctx['ads_factory'] = GoogleAdsClientFactory(ctx['arango_client'])
+    warm_schema_registry()
+    warm_display_width_table()
     print("Worker dependencies initialized.")
 
 async def shutdown(ctx):
     print("Worker shutting down...")
+    close_shared_client()
+    await close_async_client()
+    close_response_capture()
 
 async def sample_task(ctx, message: str):
     """
@@ -21,13 +33,91 @@ async def sample_task(ctx, message: str):
     print(f"Processing task: {message}")
     return f"Processed: {message}"
 
-# Worker Settings
-class WorkerSettings:
-    redis_settings = RedisSettings(
-        host=os.getenv("REDIS_HOST", "redis"),
-        port=int(os.getenv("REDIS_PORT", 6379))
+async def generate_campaign_structure_from_inputs(ctx, landing_page_url: str, keywords: list[str], bypass_cache: bool = False):
+    """
+    Wizard-mode generation as a background job.
+    Returns the GeneratedCampaign (structure + campaign_id) as builtins (kept in Redis for polling).
+    """
+    from app.domain.campaigns.services import CampaignService
+    
+    service = CampaignService(ctx['arango_client'].get_db(), ctx['arango_async'])
+    campaign = await service.generate_campaign_structure_from_inputs(
+        landing_page_url=landing_page_url,
+        keywords=keywords,
+        bypass_cache=bypass_cache
     )
-    functions = [sample_task]
+    return msgspec.to_builtins(campaign)
+
+async def generate_campaign_from_report(ctx, report_text: str, customer_id: str):
+    """
+    Deep Research Report import as a background job.
+    Returns the GeneratedCampaign (structure + campaign_id) as builtins.
+    """
+    from app.domain.campaigns.services import CampaignService
+    
+    service = CampaignService(ctx['arango_client'].get_db(), ctx['arango_async'])
+    campaign = await service.generate_campaign_from_report(
+        report_text=report_text,
+        customer_id=customer_id
+    )
+    return msgspec.to_builtins(campaign)
+
+async def ingest_search_terms(ctx, user_id: str, customer_id: str, lookback_days: int = 30):
+    """
+    Streams a customer's search term report into DailyStats.
+    """
+    from app.domain.reporting.services import SearchTermIngestionService
+    
+    db = ctx['arango_client'].get_db()
+
+    def run():
+        # credential lookup, search_stream and import_bulk are all blocking;
+        # keep the worker loop free
+        client = ctx['ads_factory'].create_client(user_id)
+        return SearchTermIngestionService(db, client).ingest(customer_id, lookback_days)
+
+    stats = await asyncio.to_thread(run)
+    print(f"Ingested {stats.rows} search term rows for {customer_id} in {stats.chunks} chunks")
+    return msgspec.to_builtins(stats)
+
+async def incremental_sync(ctx, user_id: str, customer_id: str):
+    """
+    Watermark-based sync of campaigns (via change_status) and search terms.
+    """
+    from app.domain.reporting.services import IncrementalSyncService
+    
+    # credential lookup hits ArangoDB synchronously
+    client = await asyncio.to_thread(ctx['ads_factory'].create_client, user_id)
+    service = IncrementalSyncService(ctx['arango_client'].get_db(), client)
+    campaigns = await service.sync_campaigns(customer_id)
+    search_terms = await asyncio.to_thread(service.sync_search_terms, customer_id)
+    return [msgspec.to_builtins(campaigns), msgspec.to_builtins(search_terms)]
+
+def _queue_functions(queue_name: str, coroutines: list):
+    config = QUEUES[queue_name]
+    return [
+        func(coroutine, keep_result=config.keep_result, timeout=config.job_timeout)
+        for coroutine in coroutines
+    ]
+
+# Worker Settings (one class per queue; run with `arq worker.<Settings>`)
+class WorkerSettings:
+    redis_settings = get_redis_settings()
+    queue_name = DEFAULT_QUEUE
+    functions = _queue_functions(DEFAULT_QUEUE, [sample_task, ingest_search_terms, incremental_sync])
+    on_startup = startup
+    on_shutdown = shutdown
+    max_jobs = QUEUES[DEFAULT_QUEUE].max_jobs
+    keep_result = QUEUES[DEFAULT_QUEUE].keep_result
+
+class GenerationWorkerSettings:
+    redis_settings = get_redis_settings()
+    queue_name = GENERATION_QUEUE
+    functions = _queue_functions(GENERATION_QUEUE, [
+        generate_campaign_structure_from_inputs,
+        generate_campaign_from_report
+    ])
     on_startup = startup
     on_shutdown = shutdown
-    max_jobs = 10
+    max_jobs = QUEUES[GENERATION_QUEUE].max_jobs
+    keep_result = QUEUES[GENERATION_QUEUE].keep_result